@@ -0,0 +1,132 @@
+"""
+Gunicorn configuration for komercio.
+
+Gunicorn loads this file automatically when started from the project root
+(``gunicorn --config gunicorn.conf.py``). Every value can be overridden with
+an environment variable, so the same file serves Heroku dynos, containers
+and local profiling runs.
+
+GUNICORN_WORKER_CLASS selects the serving model:
+
+* ``gthread`` (default): WSGI workers with a thread pool each, which suits
+  the mostly I/O-bound DRF views (database, cache, password hashing pool).
+* ``uvicorn``: ASGI workers serving ``komercio.asgi``, which are needed for
+  the native async views under ``api/async/``.
+* ``sync``: the classic one-request-per-process gunicorn worker.
+"""
+
+import multiprocessing
+import os
+import shutil
+import tempfile
+
+
+def env_int(name, default):
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
+def env_bool(name, default):
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+cpu_count = multiprocessing.cpu_count()
+
+WORKER_CLASSES = {
+    'sync': 'sync',
+    'gthread': 'gthread',
+    'uvicorn': 'uvicorn.workers.UvicornWorker',
+}
+
+worker_type = os.getenv('GUNICORN_WORKER_CLASS', 'gthread').lower()
+
+if worker_type not in WORKER_CLASSES:
+    raise RuntimeError(
+        f'Unknown GUNICORN_WORKER_CLASS {worker_type!r}, '
+        f'expected one of: {", ".join(WORKER_CLASSES)}'
+    )
+
+worker_class = WORKER_CLASSES[worker_type]
+
+if worker_type == 'uvicorn':
+    wsgi_app = 'komercio.asgi:application'
+    default_workers = cpu_count
+    default_threads = 1
+elif worker_type == 'gthread':
+    wsgi_app = 'komercio.wsgi:application'
+    default_workers = cpu_count + 1
+    default_threads = 4
+else:
+    wsgi_app = 'komercio.wsgi:application'
+    default_workers = cpu_count * 2 + 1
+    default_threads = 1
+
+# WEB_CONCURRENCY is the variable Heroku sets from the dyno size.
+workers = env_int('WEB_CONCURRENCY', default_workers)
+threads = env_int('GUNICORN_THREADS', default_threads)
+
+bind = os.getenv('GUNICORN_BIND', f'0.0.0.0:{os.getenv("PORT", "8000")}')
+backlog = env_int('GUNICORN_BACKLOG', 2048)
+
+# Import the application once in the master so forked workers share its
+# memory pages copy-on-write instead of each importing Django separately.
+preload_app = env_bool('GUNICORN_PRELOAD', True)
+
+# Recycle workers periodically to bound memory growth; the jitter keeps
+# them from all restarting at the same moment.
+max_requests = env_int('GUNICORN_MAX_REQUESTS', 1000)
+max_requests_jitter = env_int('GUNICORN_MAX_REQUESTS_JITTER', 100)
+
+timeout = env_int('GUNICORN_TIMEOUT', 30)
+graceful_timeout = env_int('GUNICORN_GRACEFUL_TIMEOUT', 30)
+keepalive = env_int('GUNICORN_KEEPALIVE', 5)
+
+# Workers share Prometheus samples through files in this directory so that
+# /metrics/ reports totals across processes. It must be set before the app
+# (and prometheus_client) is imported.
+if workers > 1 and 'PROMETHEUS_MULTIPROC_DIR' not in os.environ:
+    os.environ['PROMETHEUS_MULTIPROC_DIR'] = tempfile.mkdtemp(prefix='komercio-metrics-')
+
+loglevel = os.getenv('GUNICORN_LOG_LEVEL', 'info')
+accesslog = os.getenv('GUNICORN_ACCESS_LOG', '-') or None
+errorlog = '-'
+
+
+def on_starting(server):
+    from komercio.caches import cache_config, is_shared
+
+    if workers > 1 and not is_shared(cache_config()):
+        server.log.warning(
+            'CACHE_URL is not set: each of the %d workers keeps a private cache, so '
+            'writes will not invalidate cached responses or tokens in the other workers.',
+            workers,
+        )
+
+    # Samples left over from a previous run would be merged into this one.
+    metrics_dir = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+
+    if metrics_dir:
+        shutil.rmtree(metrics_dir, ignore_errors=True)
+        os.makedirs(metrics_dir, exist_ok=True)
+
+
+def child_exit(server, worker):
+    if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
+
+
+def post_fork(server, worker):
+    # Connections opened while preloading belong to the master process and
+    # must not be shared with the forked workers.
+    if not server.cfg.preload_app:
+        return
+
+    from django.db import connections
+
+    for connection in connections.all(initialized_only=True):
+        connection.close()
@@ -0,0 +1,55 @@
+from django.http import HttpResponse
+from django.views import View
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from .fast_serializers import get_values_serializer
+from .renderers import FastJSONRenderer
+
+
+def render_json(data, status=200):
+    return HttpResponse(FastJSONRenderer().render(data), content_type='application/json', status=status)
+
+
+class AsyncListView(View):
+    queryset = None
+    serializer_class = None
+    page_size = api_settings.PAGE_SIZE
+    page_query_param = 'page'
+
+    def get_queryset(self):
+        return self.queryset.all()
+
+    def get_page_link(self, request, page_number):
+        url = request.build_absolute_uri()
+
+        if page_number == 1:
+            return remove_query_param(url, self.page_query_param)
+
+        return replace_query_param(url, self.page_query_param, page_number)
+
+    async def get(self, request, *args, **kwargs):
+        values_serializer = get_values_serializer(self.serializer_class)
+        queryset = self.get_queryset()
+
+        try:
+            page_number = int(request.GET.get(self.page_query_param, 1))
+        except ValueError:
+            page_number = 0
+
+        count = await queryset.acount()
+        offset = (page_number - 1) * self.page_size
+
+        if page_number < 1 or (offset and offset >= count):
+            return render_json({'detail': 'Invalid page.'}, status=404)
+
+        rows = values_serializer.values(queryset, queryset.model._meta.pk.name)[offset:offset + self.page_size]
+        has_next = offset + self.page_size < count
+
+        return render_json({
+            'count': count,
+            'count_approximate': False,
+            'next': self.get_page_link(request, page_number + 1) if has_next else None,
+            'previous': self.get_page_link(request, page_number - 1) if page_number > 1 else None,
+            'results': values_serializer.serialize([row async for row in rows]),
+        })
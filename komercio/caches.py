@@ -0,0 +1,40 @@
+import os
+
+
+CACHE_BACKENDS = {
+    'redis': 'django.core.cache.backends.redis.RedisCache',
+    'rediss': 'django.core.cache.backends.redis.RedisCache',
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+}
+
+
+def cache_config():
+    """
+    Build the ``default`` cache entry from ``CACHE_URL``.
+
+    The response cache and its generation stamps, the shared token cache,
+    the newest accounts snapshot, replica pins and list counts all live in
+    this cache, and their invalidations only reach other server processes
+    through a shared backend such as ``redis://host:6379/0``. Without
+    ``CACHE_URL`` every process gets a private local-memory cache, which is
+    only correct with a single worker.
+    """
+    url = os.getenv('CACHE_URL') or 'locmem://'
+    scheme = url.partition('://')[0]
+
+    if scheme not in CACHE_BACKENDS:
+        raise RuntimeError(f'Unsupported CACHE_URL scheme {scheme!r}, expected one of: {", ".join(CACHE_BACKENDS)}')
+
+    config = {
+        'BACKEND': CACHE_BACKENDS[scheme],
+        'KEY_PREFIX': os.getenv('CACHE_KEY_PREFIX', 'komercio'),
+    }
+
+    if scheme != 'locmem':
+        config['LOCATION'] = url
+
+    return config
+
+
+def is_shared(config):
+    return config['BACKEND'] != CACHE_BACKENDS['locmem']
@@ -0,0 +1,63 @@
+import os
+
+import dj_database_url
+
+
+def env_bool(name, default):
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def parse_url(url):
+    ssl_require = env_bool('DB_SSL_REQUIRE', True) and not url.startswith('sqlite')
+    return dj_database_url.parse(url, ssl_require=ssl_require)
+
+
+def apply_connection_options(config):
+    conn_max_age = os.getenv('DB_CONN_MAX_AGE', '60')
+    config['CONN_MAX_AGE'] = None if conn_max_age.lower() == 'none' else int(conn_max_age)
+    config['CONN_HEALTH_CHECKS'] = env_bool('DB_CONN_HEALTH_CHECKS', True)
+
+    if env_bool('DB_PGBOUNCER', False):
+        config['DISABLE_SERVER_SIDE_CURSORS'] = True
+
+    return config
+
+
+def database_config(default):
+    """
+    Build the ``default`` database entry from the environment.
+
+    ``DATABASE_URL`` wins over ``default`` when set. Connections are kept open
+    between requests for ``DB_CONN_MAX_AGE`` seconds (``None`` keeps them
+    forever) and checked before reuse, so a connection dropped by the server
+    is replaced instead of failing the request. ``DB_PGBOUNCER`` disables
+    server-side cursors, which do not survive transaction pooling.
+    """
+    config = dict(default)
+    database_url = os.getenv('DATABASE_URL')
+
+    if database_url:
+        config.update(parse_url(database_url))
+
+    return apply_connection_options(config)
+
+
+def replica_configs():
+    """
+    Build ``replica_<n>`` entries from the comma-separated ``DATABASE_REPLICA_URLS``.
+
+    Replicas mirror ``default`` under test, so the test database is shared
+    instead of a separate, empty one being created per replica.
+    """
+    urls = [url.strip() for url in os.getenv('DATABASE_REPLICA_URLS', '').split(',') if url.strip()]
+    replicas = {}
+
+    for index, url in enumerate(urls):
+        config = apply_connection_options(parse_url(url))
+        config['TEST'] = {'MIRROR': 'default'}
+        replicas[f'replica_{index}'] = config
+
+    return replicas
@@ -0,0 +1,103 @@
+from datetime import datetime, timedelta
+from decimal import Decimal
+from functools import lru_cache
+
+from django.utils import timezone
+from rest_framework import fields
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+
+def identity(value):
+    return value
+
+
+def decimal_converter(field):
+    exponent = -field.decimal_places
+
+    def convert(value):
+        if isinstance(value, Decimal) and value.as_tuple().exponent == exponent:
+            return '{:f}'.format(value)
+
+        return field.to_representation(value)
+
+    return convert
+
+
+def datetime_converter(field):
+    zero = timedelta(0)
+
+    def convert(value):
+        in_utc = not hasattr(field, 'timezone') and timezone.get_current_timezone_name() == 'UTC'
+
+        if in_utc and isinstance(value, datetime) and value.utcoffset() == zero:
+            return value.isoformat()[:-6] + 'Z'
+
+        return field.to_representation(value)
+
+    return convert
+
+
+def get_converter(field):
+    if isinstance(field, fields.UUIDField) and field.uuid_format == 'hex_verbose':
+        return str
+
+    if isinstance(field, fields.DecimalField):
+        coerce_to_string = getattr(field, 'coerce_to_string', api_settings.COERCE_DECIMAL_TO_STRING)
+
+        if coerce_to_string and not field.localize:
+            return decimal_converter(field)
+
+    if isinstance(field, fields.DateTimeField):
+        output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+
+        if output_format and output_format.lower() == fields.ISO_8601:
+            return datetime_converter(field)
+
+    if type(field) in (fields.CharField, fields.BooleanField, fields.IntegerField, fields.ReadOnlyField):
+        return identity
+
+    return field.to_representation
+
+
+class ValuesSerializer:
+    def __init__(self, serializer_class):
+        self.converters = [
+            (name, field.source.replace('.', '__'), get_converter(field))
+            for name, field in serializer_class().fields.items()
+            if not field.write_only
+        ]
+        self.sources = [source for _, source, _ in self.converters]
+
+    def values(self, queryset, *extra):
+        return queryset.values(*self.sources, *extra)
+
+    def serialize(self, rows):
+        converters = self.converters
+
+        return [
+            {
+                name: None if row[source] is None else convert(row[source])
+                for name, source, convert in converters
+            }
+            for row in rows
+        ]
+
+
+@lru_cache(maxsize=None)
+def get_values_serializer(serializer_class):
+    return ValuesSerializer(serializer_class)
+
+
+class FastListMixin:
+    def list(self, request, *args, **kwargs):
+        values_serializer = get_values_serializer(self.get_serializer_class())
+        queryset = self.filter_queryset(self.get_queryset())
+        rows = values_serializer.values(queryset, queryset.model._meta.pk.name)
+
+        page = self.paginate_queryset(rows)
+
+        if page is not None:
+            return self.get_paginated_response(values_serializer.serialize(page))
+
+        return Response(values_serializer.serialize(rows))
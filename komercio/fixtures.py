@@ -0,0 +1,324 @@
+"""
+Streaming load and dump of Django JSON fixtures (``dumpdata`` format).
+
+``loaddata`` reads the whole file into memory and saves objects one at a time
+through ``Model.save()``. Here the fixture is decoded incrementally, rows are
+grouped per model and written with multi-row ``INSERT`` statements, so memory
+stays flat and millions of rows load in a few statements per batch.
+Rows whose primary key already exists are overwritten, as with ``loaddata``.
+Per-instance logic (``save()`` overrides and signals) does not run; callers
+are responsible for any invalidation it would have done.
+"""
+import json
+from collections import Counter, defaultdict
+
+from django.apps import apps
+from django.core.management.color import no_style
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections, models
+from django.db.models.constants import OnConflict
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+SEPARATORS = ' \t\r\n,'
+
+# Version columns behind ETags. Overwriting one with the fixture's value could
+# bring back a version, and so an ETag, that was already handed out for other
+# content, so an updated row increments it instead.
+VERSION_FIELDS = {
+    'products.product': 'version',
+}
+
+
+def iter_json_array(stream, chunk_size=1 << 16):
+    """Yield the elements of a top-level JSON array read from ``stream`` in chunks."""
+    decoder = json.JSONDecoder()
+    buffer = ''
+    position = 0
+    in_array = False
+    exhausted = False
+
+    while True:
+        while position < len(buffer) and buffer[position] in SEPARATORS:
+            position += 1
+
+        if position < len(buffer):
+            if not in_array:
+                if buffer[position] != '[':
+                    raise ValueError('Fixture must be a JSON array')
+                in_array = True
+                position += 1
+                continue
+
+            if buffer[position] == ']':
+                return
+
+            try:
+                element, position = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if exhausted:
+                    raise
+            else:
+                yield element
+                continue
+        elif exhausted:
+            if in_array:
+                raise ValueError('Fixture ended before the closing bracket')
+            return
+
+        chunk = stream.read(chunk_size)
+        if isinstance(chunk, bytes):
+            chunk = chunk.decode()
+
+        exhausted = not chunk
+        buffer = buffer[position:] + chunk
+        position = 0
+
+
+class ModelInserter:
+    """
+    Convert fixture rows for one model to database values and insert them in
+    batches.
+
+    Rows with a primary key update the existing row on a conflict, bumping
+    its ``VERSION_FIELDS`` column, and rows without one, the many-to-many
+    through rows, are skipped if already there.
+    Backends without ``ON CONFLICT`` support get plain inserts.
+    """
+
+    def __init__(self, model, connection, with_pk):
+        opts = model._meta
+        self.model = model
+        self.connection = connection
+        self.fields = [field for field in opts.concrete_fields if with_pk or not field.primary_key]
+        self.m2m_fields = {field.name: field for field in opts.many_to_many}
+
+        version_field = opts.get_field(VERSION_FIELDS[opts.label_lower]) if opts.label_lower in VERSION_FIELDS else None
+        update_columns = [field.column for field in self.fields if not field.primary_key and field is not version_field]
+
+        if with_pk and update_columns and connection.features.supports_update_conflicts_with_target:
+            on_conflict = OnConflict.UPDATE
+        elif connection.features.supports_ignore_conflicts:
+            on_conflict = OnConflict.IGNORE
+        else:
+            on_conflict = None
+
+        quote_name = connection.ops.quote_name
+        table = quote_name(opts.db_table)
+        columns = ', '.join(quote_name(field.column) for field in self.fields)
+        self.insert_sql = f'{connection.ops.insert_statement(on_conflict=on_conflict)} {table} ({columns}) '
+        self.conflict_sql = connection.ops.on_conflict_suffix_sql(self.fields, on_conflict, update_columns, [opts.pk.column])
+
+        if on_conflict == OnConflict.UPDATE and version_field is not None:
+            version = quote_name(version_field.column)
+            self.conflict_sql += f', {version} = {table}.{version} + 1'
+        self.batch_size = max(connection.ops.bulk_batch_size(self.fields, [None]), 1)
+
+    def convert(self, values):
+        row = []
+
+        for field in self.fields:
+            if field.name in values:
+                value = values[field.name]
+                target = field.target_field if field.is_relation else field
+                value = None if value is None else target.to_python(value)
+            else:
+                value = field.get_default()
+
+            row.append(field.get_db_prep_save(value, self.connection))
+
+        return row
+
+    def insert(self, rows):
+        with self.connection.cursor() as cursor:
+            for start in range(0, len(rows), self.batch_size):
+                batch = rows[start:start + self.batch_size]
+                placeholders = [['%s'] * len(self.fields)] * len(batch)
+                sql = self.insert_sql + self.connection.ops.bulk_insert_sql(self.fields, placeholders)
+
+                if self.conflict_sql:
+                    sql = f'{sql} {self.conflict_sql}'
+
+                cursor.execute(sql, [value for row in batch for value in row])
+
+
+class BatchWriter:
+    def __init__(self, using, batch_size):
+        self.connection = connections[using]
+        self.batch_size = batch_size
+        self.inserters = {}
+        self.pending = defaultdict(list)
+        self.pending_m2m = defaultdict(list)
+        self.counts = Counter()
+
+    def get_inserter(self, model, with_pk=True):
+        key = (model, with_pk)
+
+        if key not in self.inserters:
+            self.inserters[key] = ModelInserter(model, self.connection, with_pk)
+
+        return self.inserters[key]
+
+    def add(self, model, pk, values):
+        inserter = self.get_inserter(model)
+        values = dict(values)
+        m2m = {name: values.pop(name) for name in inserter.m2m_fields if name in values}
+        values[model._meta.pk.name] = pk
+        row = inserter.convert(values)
+        self.pending[inserter].append(row)
+
+        pk = model._meta.pk.to_python(pk)
+
+        for name, targets in m2m.items():
+            field = inserter.m2m_fields[name]
+            through = self.get_inserter(field.remote_field.through, with_pk=False)
+            source = field.m2m_field_name()
+            target = field.m2m_reverse_field_name()
+            self.pending_m2m[through].extend(through.convert({source: pk, target: value}) for value in targets)
+
+        if len(self.pending[inserter]) >= self.batch_size:
+            self.flush(inserter)
+
+    def flush(self, inserter):
+        rows = self.pending.pop(inserter, [])
+
+        if rows:
+            inserter.insert(rows)
+            self.counts[inserter.model._meta.label] += len(rows)
+
+    def flush_all(self):
+        for inserter in list(self.pending):
+            self.flush(inserter)
+
+        # Through rows go last, once every row they point at is written.
+        for inserter, rows in self.pending_m2m.items():
+            inserter.insert(rows)
+
+        self.pending_m2m.clear()
+
+
+def load_fixture(stream, using='default', batch_size=1000):
+    """
+    Load a fixture from ``stream`` into ``using`` and return row counts per model.
+
+    Call it inside a transaction: rows are flushed per model, so a row may be
+    written before the row its foreign key points at, which the database only
+    accepts because Django creates foreign keys as deferrable.
+    """
+    writer = BatchWriter(using, batch_size)
+    seen_models = set()
+
+    for obj in iter_json_array(stream):
+        model = apps.get_model(obj['model'])
+        writer.add(model, obj['pk'], obj.get('fields', {}))
+        seen_models.add(model)
+
+    writer.flush_all()
+
+    connection = connections[using]
+    sequence_sql = connection.ops.sequence_reset_sql(no_style(), list(seen_models))
+
+    if sequence_sql:
+        with connection.cursor() as cursor:
+            for sql in sequence_sql:
+                cursor.execute(sql)
+
+    return writer.counts
+
+
+def encode(obj):
+    if orjson is None:
+        return json.dumps(obj, cls=DjangoJSONEncoder)
+
+    return orjson.dumps(obj, default=DjangoJSONEncoder().default, option=orjson.OPT_UTC_Z).decode()
+
+
+def iter_rows(model, using, batch_size):
+    """Yield serialized objects for ``model`` in pk order, one keyset page at a time."""
+    opts = model._meta
+    fields = [field for field in opts.concrete_fields if not field.primary_key and field.serialize]
+    m2m_fields = [field for field in opts.many_to_many if field.serialize and field.remote_field.through._meta.auto_created]
+    queryset = model._base_manager.using(using).order_by('pk').values('pk', *(field.attname for field in fields))
+    last_pk = None
+
+    while True:
+        page = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        rows = list(page[:batch_size])
+
+        if not rows:
+            return
+
+        pks = [row['pk'] for row in rows]
+        m2m_values = {}
+
+        for field in m2m_fields:
+            through = field.remote_field.through
+            source = f'{field.m2m_field_name()}_id'
+            target = f'{field.m2m_reverse_field_name()}_id'
+            related = defaultdict(list)
+
+            for source_pk, target_pk in through._base_manager.using(using).filter(**{f'{source}__in': pks}).values_list(source, target):
+                related[source_pk].append(target_pk)
+
+            m2m_values[field.name] = related
+
+        for row in rows:
+            pk = row['pk']
+            values = {field.name: row[field.attname] for field in fields}
+
+            for name, related in m2m_values.items():
+                values[name] = related.get(pk, [])
+
+            yield {'model': opts.label_lower, 'pk': pk, 'fields': values}
+
+        last_pk = pks[-1]
+
+
+def dump_fixture(stream, model_list, using='default', batch_size=1000):
+    """
+    Write ``model_list`` to ``stream`` as a fixture ``loaddata`` can read and
+    return row counts per model. Objects are written one per line, in the
+    order of ``model_list``.
+    """
+    counts = Counter()
+    first = True
+    stream.write('[')
+
+    for model in model_list:
+        for obj in iter_rows(model, using, batch_size):
+            stream.write('\n' if first else ',\n')
+            stream.write(encode(obj))
+            counts[model._meta.label] += 1
+            first = False
+
+    stream.write('\n]\n')
+
+    return counts
+
+
+def sort_models(model_list):
+    """Order ``model_list`` so that models come after the models they reference."""
+    remaining = list(model_list)
+    ordered = []
+
+    while remaining:
+        for model in remaining:
+            dependencies = {
+                field.remote_field.model
+                for field in model._meta.concrete_fields
+                if isinstance(field, models.ForeignKey) and field.remote_field.model is not model
+            }
+
+            if not dependencies & set(remaining):
+                ordered.append(model)
+                remaining.remove(model)
+                break
+        else:
+            ordered.extend(remaining)
+            break
+
+    return ordered
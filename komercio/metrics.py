@@ -0,0 +1,164 @@
+"""
+Prometheus metrics for HTTP requests.
+
+When ``PROMETHEUS_MULTIPROC_DIR`` is set (gunicorn.conf.py sets it for
+multi-worker servers), every worker writes its samples to files in that
+directory and the metrics view merges them, so a scrape sees the totals of
+all workers rather than of whichever worker answered it.
+"""
+import hmac
+import os
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.http import Http404, HttpResponse
+from prometheus_client import REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest, multiprocess
+from prometheus_client.exposition import CONTENT_TYPE_LATEST
+
+
+LABELS = ['method', 'route']
+METHODS = {'GET', 'HEAD', 'OPTIONS', 'POST', 'PUT', 'PATCH', 'DELETE'}
+
+REQUESTS = Counter(
+    'komercio_http_requests',
+    'HTTP requests by route and status code.',
+    LABELS + ['status'],
+)
+REQUEST_DURATION = Histogram(
+    'komercio_http_request_duration_seconds',
+    'Time spent handling a request, including middleware.',
+    LABELS,
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+DB_QUERIES = Histogram(
+    'komercio_http_request_db_queries',
+    'Database queries executed per request.',
+    LABELS,
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100),
+)
+DB_DURATION = Histogram(
+    'komercio_http_request_db_duration_seconds',
+    'Time spent in database queries per request.',
+    LABELS,
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+RESPONSE_SIZE = Histogram(
+    'komercio_http_response_size_bytes',
+    'Response body size; streaming responses are not measured.',
+    LABELS,
+    buckets=(256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304),
+)
+
+
+class QueryStats:
+    __slots__ = ('count', 'duration', 'timeline')
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        # (start, duration, sql) per query when a profiler asks for it.
+        self.timeline = None
+
+
+_query_stats = ContextVar('query_stats', default=None)
+
+
+def record_query(execute, sql, params, many, context):
+    stats = _query_stats.get()
+
+    if stats is None:
+        return execute(sql, params, many, context)
+
+    started = time.perf_counter()
+
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration = time.perf_counter() - started
+        stats.count += 1
+        stats.duration += duration
+
+        if stats.timeline is not None:
+            stats.timeline.append((started, duration, sql))
+
+
+def add_query_recorder(connection):
+    # Inserting at the front keeps it clear of execute_wrapper() blocks,
+    # which pop from the end.
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, record_query)
+
+
+@receiver(connection_created)
+def install_query_recorder(sender, connection, **kwargs):
+    # Connections are per thread, so the recorder goes on each one as it
+    # connects; the context variable ties queries to the current request,
+    # including async views whose queries run in a worker thread.
+    add_query_recorder(connection)
+
+
+def install_on_open_connections():
+    for connection in connections.all(initialized_only=True):
+        add_query_recorder(connection)
+
+
+def start_query_recording():
+    stats = QueryStats()
+    return stats, _query_stats.set(stats)
+
+
+def current_query_stats():
+    return _query_stats.get()
+
+
+def stop_query_recording(token):
+    _query_stats.reset(token)
+
+
+def observe_request(request, response, stats, duration):
+    match = request.resolver_match
+    labels = (
+        request.method if request.method in METHODS else 'other',
+        match.route if match is not None else 'unmatched',
+    )
+
+    REQUESTS.labels(*labels, str(response.status_code)).inc()
+    REQUEST_DURATION.labels(*labels).observe(duration)
+    DB_QUERIES.labels(*labels).observe(stats.count)
+    DB_DURATION.labels(*labels).observe(stats.duration)
+
+    if not response.streaming:
+        RESPONSE_SIZE.labels(*labels).observe(len(response.content))
+
+
+def get_registry():
+    if 'PROMETHEUS_MULTIPROC_DIR' not in os.environ:
+        return REGISTRY
+
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def is_allowed(request):
+    token = settings.METRICS['TOKEN']
+
+    if token:
+        expected = f'Bearer {token}'
+        # compare_digest rejects str with non-ASCII characters, which clients
+        # can send in headers.
+        return hmac.compare_digest(request.META.get('HTTP_AUTHORIZATION', '').encode(), expected.encode())
+
+    return request.META.get('REMOTE_ADDR') in settings.METRICS['ALLOWED_IPS']
+
+
+def metrics_view(request):
+    """Serve the metrics in Prometheus text format to internal callers only."""
+    if not is_allowed(request):
+        raise Http404
+
+    return HttpResponse(generate_latest(get_registry()), content_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,272 @@
+import asyncio
+import cProfile
+import hashlib
+import random
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import MiddlewareNotUsed
+from django.urls import reverse
+from rest_framework.permissions import SAFE_METHODS
+
+from komercio import metrics, profiling
+from komercio.routers import replica_reads
+
+
+PIN_PREFIX = 'replica-pin:'
+
+
+class AsyncCapableMiddleware:
+    """
+    Base for middleware that runs natively under both WSGI and ASGI.
+
+    Django adapts sync-only middleware on an ASGI server by running it, and
+    everything below it, through a thread per request. Subclasses implement
+    ``__call__`` and ``__acall__``; like Django's ``MiddlewareMixin``, the
+    instance marks itself as a coroutine function when the chain below it
+    is async so that ``__call__`` dispatches to ``__acall__``.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+        if asyncio.iscoroutinefunction(get_response):
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def is_async(self):
+        return getattr(self, '_is_coroutine', None) is not None
+
+
+class ReplicaRoutingMiddleware(AsyncCapableMiddleware):
+    """
+    Serve safe-method requests from the read replicas, except for clients that
+    wrote recently.
+
+    A write pins its client to the primary for ``PIN_SECONDS`` so that a client
+    always reads its own writes despite replication lag. Clients are recognised
+    by a cookie and, for API clients that drop cookies, by their
+    ``Authorization`` header.
+    """
+
+    def __call__(self, request):
+        if self.is_async():
+            return self.__acall__(request)
+
+        if not settings.DATABASE_REPLICAS:
+            return self.get_response(request)
+
+        is_read = request.method in SAFE_METHODS
+
+        with replica_reads(is_read and not self.is_pinned(request)):
+            response = self.get_response(request)
+
+        if not is_read:
+            self.pin(request, response)
+
+        return response
+
+    async def __acall__(self, request):
+        if not settings.DATABASE_REPLICAS:
+            return await self.get_response(request)
+
+        is_read = request.method in SAFE_METHODS
+
+        with replica_reads(is_read and not await self.ais_pinned(request)):
+            response = await self.get_response(request)
+
+        if not is_read:
+            await self.apin(request, response)
+
+        return response
+
+    def get_cache(self):
+        return caches[settings.REPLICA_ROUTING['CACHE_ALIAS']]
+
+    def get_pin_key(self, request):
+        authorization = request.META.get('HTTP_AUTHORIZATION')
+        if not authorization:
+            return None
+        return PIN_PREFIX + hashlib.sha256(authorization.encode()).hexdigest()
+
+    def is_pinned(self, request):
+        if settings.REPLICA_ROUTING['COOKIE_NAME'] in request.COOKIES:
+            return True
+
+        key = self.get_pin_key(request)
+        return key is not None and self.get_cache().get(key) is not None
+
+    async def ais_pinned(self, request):
+        if settings.REPLICA_ROUTING['COOKIE_NAME'] in request.COOKIES:
+            return True
+
+        key = self.get_pin_key(request)
+        return key is not None and await self.get_cache().aget(key) is not None
+
+    def set_pin_cookie(self, response):
+        seconds = settings.REPLICA_ROUTING['PIN_SECONDS']
+        response.set_cookie(settings.REPLICA_ROUTING['COOKIE_NAME'], '1', max_age=seconds, httponly=True, samesite='Lax')
+
+    def pin(self, request, response):
+        self.set_pin_cookie(response)
+
+        key = self.get_pin_key(request)
+        if key is not None:
+            self.get_cache().set(key, 1, settings.REPLICA_ROUTING['PIN_SECONDS'])
+
+    async def apin(self, request, response):
+        self.set_pin_cookie(response)
+
+        key = self.get_pin_key(request)
+        if key is not None:
+            await self.get_cache().aset(key, 1, settings.REPLICA_ROUTING['PIN_SECONDS'])
+
+
+class MetricsMiddleware(AsyncCapableMiddleware):
+    """
+    Record latency, database queries and time, response size and status per
+    route into the Prometheus metrics served by ``komercio.metrics.metrics_view``.
+
+    Keep it first in ``MIDDLEWARE`` so the measured latency covers the other
+    middleware too.
+    """
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        # Connections opened before this module was imported missed the
+        # connection_created signal.
+        metrics.install_on_open_connections()
+
+    def __call__(self, request):
+        if self.is_async():
+            return self.__acall__(request)
+
+        started = time.perf_counter()
+        stats, token = metrics.start_query_recording()
+
+        try:
+            response = self.get_response(request)
+        finally:
+            metrics.stop_query_recording(token)
+
+        metrics.observe_request(request, response, stats, time.perf_counter() - started)
+        return response
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        stats, token = metrics.start_query_recording()
+
+        try:
+            # Queries of async views run in sync_to_async threads, which copy
+            # the context and so still count into stats.
+            response = await self.get_response(request)
+        finally:
+            metrics.stop_query_recording(token)
+
+        metrics.observe_request(request, response, stats, time.perf_counter() - started)
+        return response
+
+
+class ProfilingMiddleware(AsyncCapableMiddleware):
+    """
+    Capture a cProfile profile and SQL timeline of requests that ask for one
+    with ``X-Profile: <PROFILING TOKEN>``, and of a ``SAMPLE_RATE`` fraction of
+    all requests, into ``komercio.profiling`` files.
+
+    Without a token or a sample rate the middleware removes itself from the
+    chain at startup, so a disabled profiler costs nothing.
+    """
+
+    def __init__(self, get_response):
+        if not settings.PROFILING['TOKEN'] and not settings.PROFILING['SAMPLE_RATE']:
+            raise MiddlewareNotUsed
+
+        super().__init__(get_response)
+        self.profiling_async = False
+
+    def should_profile(self, request):
+        # Fetching profiles must not write new ones and prune what is fetched.
+        if request.path_info.startswith(reverse('profile-list')):
+            return False
+
+        if profiling.is_authorized(request):
+            return True
+
+        rate = settings.PROFILING['SAMPLE_RATE']
+        return rate > 0 and random.random() < rate
+
+    def get_format(self, request):
+        requested = request.META.get(profiling.FORMAT_HEADER)
+        return requested if requested in profiling.FORMATS else settings.PROFILING['FORMAT']
+
+    def start_timeline(self):
+        stats = metrics.current_query_stats()
+        token = None
+
+        if stats is None:
+            stats, token = metrics.start_query_recording()
+
+        stats.timeline = []
+        return stats, token
+
+    def stop_timeline(self, stats, token):
+        timeline = stats.timeline
+        stats.timeline = None
+
+        if token is not None:
+            metrics.stop_query_recording(token)
+
+        return timeline
+
+    def save(self, request, response, profiler, timeline, started):
+        profile_id = profiling.make_profile_id(request)
+        path = profiling.save_profile(profiler, timeline, started, profile_id, self.get_format(request))
+        response['X-Profile-Id'] = path.name
+        return response
+
+    def __call__(self, request):
+        if self.is_async():
+            return self.__acall__(request)
+
+        if not self.should_profile(request):
+            return self.get_response(request)
+
+        stats, token = self.start_timeline()
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+
+        try:
+            response = profiler.runcall(profiling.call_profiled, self.get_response, request)
+        finally:
+            timeline = self.stop_timeline(stats, token)
+
+        return self.save(request, response, profiler, timeline, started)
+
+    async def __acall__(self, request):
+        # cProfile follows a single thread and every async request shares the
+        # event loop's, so one async request is profiled at a time. Work that
+        # views hand to sync_to_async threads shows up only in the SQL
+        # timeline.
+        if self.profiling_async or not self.should_profile(request):
+            return await self.get_response(request)
+
+        self.profiling_async = True
+        stats, token = self.start_timeline()
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+
+        try:
+            profiler.enable()
+            try:
+                response = await profiling.acall_profiled(self.get_response, request)
+            finally:
+                profiler.disable()
+        finally:
+            timeline = self.stop_timeline(stats, token)
+            self.profiling_async = False
+
+        return await sync_to_async(self.save)(request, response, profiler, timeline, started)
@@ -0,0 +1,160 @@
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import EmptyResultSet
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
+from django.db import connections
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+
+
+COUNT_PREFIX = 'count:'
+SMALL_COUNT_PREFIX = 'small-count:'
+
+
+def get_count_cache():
+    return caches[settings.PAGINATION_COUNT['CACHE_ALIAS']]
+
+
+def get_count_digest(queryset):
+    sql, params = queryset.order_by().query.sql_with_params()
+    return hashlib.md5(f'{queryset.db}:{sql}:{params!r}'.encode()).hexdigest()
+
+
+def estimate_count(queryset):
+    """Return the planner's row estimate for ``queryset``, or None if the backend has none."""
+    if connections[queryset.db].vendor != 'postgresql':
+        return None
+
+    plan = json.loads(queryset.order_by().explain(format='json'))
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def get_count(object_list):
+    """
+    Return ``(count, is_approximate)`` for ``object_list``.
+
+    Counts at or above ``THRESHOLD`` are cached for ``TTL`` seconds and
+    reported as approximate when served from the cache. Where the database
+    offers a planner estimate, an estimate at or above the threshold is used
+    instead of scanning the table; smaller results are always counted exactly,
+    and for ``TTL`` seconds after such a count without asking the planner
+    first.
+    """
+    if not isinstance(object_list, QuerySet):
+        return len(object_list), False
+
+    try:
+        digest = get_count_digest(object_list)
+    except EmptyResultSet:
+        return 0, False
+
+    key = COUNT_PREFIX + digest
+    small_key = SMALL_COUNT_PREFIX + digest
+    options = settings.PAGINATION_COUNT
+    cache = get_count_cache()
+    found = cache.get_many([key, small_key])
+
+    if key in found:
+        return found[key], True
+
+    # The planner was asked last time and the list was small, so an
+    # estimate would only add a query in front of the exact count.
+    count = None if small_key in found else estimate_count(object_list)
+    is_approximate = count is not None and count >= options['THRESHOLD']
+
+    if not is_approximate:
+        count = object_list.count()
+
+    if count >= options['THRESHOLD']:
+        cache.set(key, count, options['TTL'])
+    else:
+        cache.set(small_key, True, options['TTL'])
+
+    return count, is_approximate
+
+
+class ApproximatePage(Page):
+    def __init__(self, object_list, number, paginator, has_next):
+        super().__init__(object_list, number, paginator)
+        self._has_next = has_next
+
+    def has_next(self):
+        return self._has_next
+
+
+class CachedCountPaginator(Paginator):
+    count_is_approximate = False
+
+    @cached_property
+    def count(self):
+        count, self.count_is_approximate = get_count(self.object_list)
+        return count
+
+    def validate_number(self, number):
+        if not (self.count and self.count_is_approximate):
+            return super().validate_number(number)
+
+        # The last page is only estimated, so page() finds out whether a page
+        # past the first exists.
+        try:
+            if isinstance(number, float) and not number.is_integer():
+                raise ValueError
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger('That page number is not an integer')
+
+        if number < 1:
+            raise EmptyPage('That page number is less than 1')
+
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+
+        if not self.count_is_approximate:
+            return super().page(number)
+
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom:bottom + self.per_page + 1])
+
+        if not rows and number > 1:
+            raise EmptyPage('That page contains no results')
+
+        return ApproximatePage(rows[:self.per_page], number, self, has_next=len(rows) > self.per_page)
+
+
+class CachedCountPagination(PageNumberPagination):
+    """
+    Page number pagination that avoids an exact ``COUNT(*)`` on large lists.
+
+    The response carries ``count_approximate`` so clients know whether
+    ``count`` is exact.
+    """
+
+    django_paginator_class = CachedCountPaginator
+
+    def get_paginated_response(self, data):
+        return Response({
+            'count': self.page.paginator.count,
+            'count_approximate': self.page.paginator.count_is_approximate,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        schema = super().get_paginated_response_schema(schema)
+        schema['properties'] = {
+            'count': schema['properties']['count'],
+            'count_approximate': {
+                'type': 'boolean',
+                'example': False,
+            },
+            **schema['properties'],
+        }
+        return schema
@@ -0,0 +1,213 @@
+"""
+On-demand CPU and SQL profiles of single requests.
+
+A request is profiled when it carries ``X-Profile: <PROFILING TOKEN>`` or is
+picked by ``SAMPLE_RATE``. Its cProfile data and SQL timeline are written to
+``DIRECTORY`` as a pstats file with a ``.sql.json`` sidecar or as a speedscope
+file (open it at https://www.speedscope.app), and the response names the file
+in ``X-Profile-Id``. Files are listed and downloaded through ``/profiles/``
+with the same header.
+"""
+import cProfile
+import hmac
+import json
+import os
+import pstats
+import re
+import time
+import uuid
+from pathlib import Path
+
+from django.conf import settings
+from django.http import FileResponse, Http404, JsonResponse
+
+
+PROFILE_HEADER = 'HTTP_X_PROFILE'
+FORMAT_HEADER = 'HTTP_X_PROFILE_FORMAT'
+FORMATS = {
+    'speedscope': '.speedscope.json',
+    'pstats': '.pstats',
+}
+MAX_DEPTH = 200
+# Branches below this share of the request's time are folded into their
+# caller, which bounds the size of speedscope files.
+MIN_WEIGHT = 0.001
+
+
+def get_directory():
+    directory = Path(settings.PROFILING['DIRECTORY'])
+    directory.mkdir(parents=True, exist_ok=True)
+    return directory
+
+
+def is_authorized(request):
+    token = settings.PROFILING['TOKEN']
+    # compare_digest rejects str with non-ASCII characters, which clients
+    # can send in headers.
+    return bool(token) and hmac.compare_digest(request.META.get(PROFILE_HEADER, '').encode(), token.encode())
+
+
+def make_profile_id(request):
+    match = request.resolver_match
+    route = match.route if match is not None else request.path
+    slug = re.sub(r'[^a-zA-Z0-9]+', '-', route).strip('-') or 'root'
+    return f'{time.strftime("%Y%m%dT%H%M%S")}-{request.method.lower()}-{slug}-{uuid.uuid4().hex[:8]}'
+
+
+def call_profiled(get_response, request):
+    # The fixed root of every profile: Django's middleware chain re-enters
+    # its own wrappers, so no frame inside it is free of callers.
+    return get_response(request)
+
+
+async def acall_profiled(get_response, request):
+    return await get_response(request)
+
+
+ROOTS = [cProfile.label(call_profiled.__code__), cProfile.label(acall_profiled.__code__)]
+
+
+def frame_name(function):
+    filename, line, name = function
+    return {'name': name, 'file': filename, 'line': line}
+
+
+def to_speedscope(stats, timeline, started, name):
+    """
+    Convert cProfile statistics into a speedscope document.
+
+    cProfile keeps caller/callee totals rather than stacks, so starting
+    from ``call_profiled`` (or ``acall_profiled``) each function's time is split over its callees
+    in proportion to their totals on that edge, which draws as a flame
+    graph of where time went.
+    The SQL queries become a second, evented profile on the request
+    timeline.
+    """
+    frames = []
+    frame_index = {}
+
+    def index(key, frame):
+        if key not in frame_index:
+            frame_index[key] = len(frames)
+            frames.append(frame)
+        return frame_index[key]
+
+    callees = {}
+    for function, (_, _, _, _, callers) in stats.stats.items():
+        for caller, (_, _, _, cumulative) in callers.items():
+            callees.setdefault(caller, []).append((function, cumulative))
+
+    samples = []
+    weights = []
+
+    def walk(function, allotted, stack, seen, cutoff):
+        _, _, own, cumulative, _ = stats.stats[function]
+        scale = allotted / cumulative if cumulative else 0
+        stack = stack + [index(function, frame_name(function))]
+        seen = seen | {function}
+        weight = own * scale
+
+        for callee, edge in callees.get(function, []):
+            if callee in seen:
+                continue
+
+            if edge * scale < cutoff or len(stack) >= MAX_DEPTH:
+                weight += edge * scale
+            else:
+                walk(callee, edge * scale, stack, seen, cutoff)
+
+        if weight > 0:
+            samples.append(stack)
+            weights.append(weight)
+
+    for root in ROOTS:
+        if root in stats.stats:
+            cumulative = stats.stats[root][3]
+            walk(root, cumulative, [], frozenset(), cumulative * MIN_WEIGHT)
+
+    total = sum(weights)
+    events = []
+    end = 0.0
+
+    for start, duration, sql in timeline:
+        frame = index(('sql', sql), {'name': sql[:200]})
+        offset = start - started
+        end = max(end, offset + duration)
+        events.append({'type': 'O', 'frame': frame, 'at': offset})
+        events.append({'type': 'C', 'frame': frame, 'at': offset + duration})
+
+    return {
+        '$schema': 'https://www.speedscope.app/file-format-schema.json',
+        'name': name,
+        'exporter': 'komercio',
+        'activeProfileIndex': 0,
+        'shared': {'frames': frames},
+        'profiles': [
+            {
+                'type': 'sampled',
+                'name': f'{name} CPU',
+                'unit': 'seconds',
+                'startValue': 0,
+                'endValue': total,
+                'samples': samples,
+                'weights': weights,
+            },
+            {
+                'type': 'evented',
+                'name': f'{name} SQL',
+                'unit': 'seconds',
+                'startValue': 0,
+                'endValue': end,
+                'events': events,
+            },
+        ],
+    }
+
+
+def save_profile(profiler, timeline, started, profile_id, profile_format):
+    directory = get_directory()
+    stats = pstats.Stats(profiler)
+
+    path = directory / f'{profile_id}{FORMATS[profile_format]}'
+
+    if profile_format == 'pstats':
+        stats.dump_stats(path)
+        queries = [
+            {'start': start - started, 'duration': duration, 'sql': sql}
+            for start, duration, sql in timeline
+        ]
+        (directory / f'{profile_id}.sql.json').write_text(json.dumps(queries))
+    else:
+        document = to_speedscope(stats, timeline, started, profile_id)
+        path.write_text(json.dumps(document))
+
+    prune(directory)
+    return path
+
+
+def prune(directory):
+    files = sorted(directory.iterdir(), key=lambda path: path.stat().st_mtime, reverse=True)
+
+    for path in files[settings.PROFILING['MAX_FILES']:]:
+        path.unlink(missing_ok=True)
+
+
+def profile_list_view(request):
+    if not is_authorized(request):
+        raise Http404
+
+    files = sorted(get_directory().iterdir(), key=lambda path: path.stat().st_mtime, reverse=True)
+    return JsonResponse({'profiles': [path.name for path in files]})
+
+
+def profile_download_view(request, name):
+    if not is_authorized(request):
+        raise Http404
+
+    directory = get_directory()
+    path = directory / os.path.basename(name)
+
+    if not path.is_file():
+        raise Http404
+
+    return FileResponse(open(path, 'rb'), as_attachment=True, filename=path.name)
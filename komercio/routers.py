@@ -0,0 +1,42 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+
+_replica_reads = ContextVar('replica_reads', default=False)
+
+
+@contextmanager
+def replica_reads(enabled=True):
+    token = _replica_reads.set(enabled)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+def replica_reads_enabled():
+    return bool(settings.DATABASE_REPLICAS) and _replica_reads.get()
+
+
+class ReplicaRouter:
+    """
+    Send reads to a random ``DATABASE_REPLICAS`` alias while ``replica_reads()``
+    is active and everything else to ``default``.
+
+    Replica reads are opt-in so that management commands, signals and write
+    requests keep reading their own writes from the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        if replica_reads_enabled():
+            return random.choice(settings.DATABASE_REPLICAS)
+        return 'default'
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
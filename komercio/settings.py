@@ -9,12 +9,13 @@ https://docs.djangoproject.com/en/4.1/topics/settings/
 For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.1/ref/settings/
 """
-import dj_database_url
-
 from pathlib import Path
 import os
 import dotenv
 
+from komercio.caches import cache_config
+from komercio.database import database_config, replica_configs
+
 dotenv.load_dotenv()
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -50,7 +51,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'komercio.middleware.MetricsMiddleware',
+    'komercio.middleware.ProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'komercio.middleware.ReplicaRoutingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -85,20 +89,39 @@ WSGI_APPLICATION = 'komercio.wsgi.application'
 
 
 DATABASES = {
-    'default': {
+    'default': database_config({
         'ENGINE': 'django.db.backends.postgresql',
         'NAME': os.getenv('POSTGRES_DB'),
         'USER': os.getenv('POSTGRES_USER'),
         'PASSWORD': os.getenv("POSTGRES_PASSWORD"),
-        'HOST': "localhost",
-        'PORT': 5432,
-    },
+        'HOST': os.getenv('POSTGRES_HOST', "localhost"),
+        'PORT': int(os.getenv('POSTGRES_PORT', 5432)),
+    }),
     'test': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
     }
 }
 
+# Read replicas, e.g. DATABASE_REPLICA_URLS=sqlite:///replica.sqlite3 locally.
+# Safe-method requests read from them unless the client wrote within the
+# last PIN_SECONDS.
+DATABASES.update(replica_configs())
+
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias.startswith('replica_')]
+
+DATABASE_ROUTERS = ['komercio.routers.ReplicaRouter']
+
+# uuid7 keys are time-ordered, so inserts append to the primary key index
+# instead of splitting random pages. 'uuid4' restores fully random keys.
+PRIMARY_KEY_FACTORY = os.getenv('PRIMARY_KEY_FACTORY', 'uuid7')
+
+REPLICA_ROUTING = {
+    'PIN_SECONDS': int(os.getenv('REPLICA_PIN_SECONDS', 15)),
+    'COOKIE_NAME': os.getenv('REPLICA_PIN_COOKIE', 'db_primary_pin'),
+    'CACHE_ALIAS': os.getenv('REPLICA_PIN_CACHE_ALIAS', 'default'),
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.1/ref/settings/#auth-password-validators
@@ -119,6 +142,31 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+PASSWORD_HASHER = os.getenv('PASSWORD_HASHER', 'argon2')
+
+PASSWORD_HASHER_CLASSES = {
+    'argon2': 'users.hashers.TunableArgon2PasswordHasher',
+    'bcrypt': 'users.hashers.TunableBCryptSHA256PasswordHasher',
+    'pbkdf2': 'users.hashers.TunablePBKDF2PasswordHasher',
+}
+
+PASSWORD_HASHERS = [PASSWORD_HASHER_CLASSES[PASSWORD_HASHER]] + [
+    hasher for name, hasher in PASSWORD_HASHER_CLASSES.items() if name != PASSWORD_HASHER
+]
+
+PASSWORD_HASHER_PARAMS = {
+    'ARGON2_TIME_COST': int(os.getenv('ARGON2_TIME_COST', 2)),
+    'ARGON2_MEMORY_COST': int(os.getenv('ARGON2_MEMORY_COST', 19456)),
+    'ARGON2_PARALLELISM': int(os.getenv('ARGON2_PARALLELISM', 1)),
+    'BCRYPT_ROUNDS': int(os.getenv('BCRYPT_ROUNDS', 12)),
+    'PBKDF2_ITERATIONS': int(os.getenv('PBKDF2_ITERATIONS', 390000)),
+}
+
+PASSWORD_HASHING_THREADS = int(os.getenv('PASSWORD_HASHING_THREADS', os.cpu_count() or 1))
+
+AUTHENTICATION_BACKENDS = ['users.backends.PooledModelBackend']
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/4.1/topics/i18n/
 
@@ -145,7 +193,16 @@ AUTH_USER_MODEL = 'users.Account'
 
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
+    "DEFAULT_PAGINATION_CLASS": "komercio.pagination.CachedCountPagination",
+    "DEFAULT_RENDERER_CLASSES": [
+        "komercio.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "komercio.parsers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
     "PAGE_SIZE": 2,
 }
 
@@ -155,10 +212,55 @@ SPECTACULAR_SETTINGS = {
     'VERSION': '1.0.0',
 }
 
+# Cached responses, tokens, counts and replica pins are only invalidated
+# across server processes when CACHE_URL points at a shared cache, e.g.
+# CACHE_URL=redis://localhost:6379/0. The local-memory fallback keeps them
+# correct within a single worker only.
+CACHES = {
+    'default': cache_config(),
+}
+
+NEWEST_ACCOUNTS_LIMIT = int(os.getenv('NEWEST_ACCOUNTS_LIMIT', 100))
+NEWEST_ACCOUNTS_TTL = int(os.getenv('NEWEST_ACCOUNTS_TTL', 300))
+NEWEST_ACCOUNTS_CACHE_ALIAS = os.getenv('NEWEST_ACCOUNTS_CACHE_ALIAS', 'default')
+
+RESPONSE_CACHE = {
+    'CACHE_ALIAS': os.getenv('RESPONSE_CACHE_ALIAS', 'default'),
+    'TTL': int(os.getenv('RESPONSE_CACHE_TTL', 300)),
+}
+
+PAGINATION_COUNT = {
+    'CACHE_ALIAS': os.getenv('PAGINATION_COUNT_CACHE_ALIAS', 'default'),
+    'TTL': int(os.getenv('PAGINATION_COUNT_TTL', 60)),
+    'THRESHOLD': int(os.getenv('PAGINATION_COUNT_THRESHOLD', 10000)),
+}
+
+# /metrics/ answers callers presenting METRICS_TOKEN as a bearer token or,
+# when no token is set, requests from METRICS_ALLOWED_IPS.
+METRICS = {
+    'TOKEN': os.getenv('METRICS_TOKEN'),
+    'ALLOWED_IPS': os.getenv('METRICS_ALLOWED_IPS', '127.0.0.1,::1').split(','),
+}
+
+# Requests sent with an "X-Profile: <PROFILING_TOKEN>" header, plus a random
+# PROFILING_SAMPLE_RATE fraction of all requests, are profiled into
+# PROFILING_DIRECTORY and can be downloaded from /profiles/ with that header.
+# With neither set, ProfilingMiddleware is left out of the chain entirely.
+PROFILING = {
+    'TOKEN': os.getenv('PROFILING_TOKEN'),
+    'SAMPLE_RATE': float(os.getenv('PROFILING_SAMPLE_RATE', 0)),
+    'DIRECTORY': os.getenv('PROFILING_DIRECTORY', BASE_DIR / 'profiles'),
+    'FORMAT': os.getenv('PROFILING_FORMAT', 'pstats'),
+    'MAX_FILES': int(os.getenv('PROFILING_MAX_FILES', 100)),
+}
+
+TOKEN_CACHE = {
+    'MAX_SIZE': int(os.getenv('TOKEN_CACHE_MAX_SIZE', 1024)),
+    'TTL': int(os.getenv('TOKEN_CACHE_TTL', 60)),
+    'CACHE_ALIAS': os.getenv('TOKEN_CACHE_ALIAS', 'default'),
+}
+
 DATABASE_URL = os.environ.get('DATABASE_URL')
 
 if DATABASE_URL:
-    db_from_env = dj_database_url.config(
-        default=DATABASE_URL, conn_max_age=500, ssl_require=True)
-    DATABASES['default'].update(db_from_env)
     DEBUG = False
\ No newline at end of file
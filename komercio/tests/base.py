@@ -0,0 +1,37 @@
+from django.core.cache import cache
+from rest_framework.test import APITestCase
+
+from products.models import Product
+from users.models import Account
+
+
+ACCOUNT_DATA = {
+    "username": "cloud",
+    "password": "1234",
+    "first_name": "cloud",
+    "last_name": "thorson",
+    "is_seller": True
+}
+
+
+class SellerTestCase(APITestCase):
+    """A seller, and an empty cache before every test."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+
+        cls.account_data = ACCOUNT_DATA
+        cls.seller = Account.objects.create_user(**ACCOUNT_DATA)
+
+    def setUp(self) -> None:
+        cache.clear()
+
+
+class SellerProductTestCase(SellerTestCase):
+    """A seller with one product, and an empty cache before every test."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        super().setUpTestData()
+
+        cls.product = Product.objects.create(description="Smartband XYZ", price="10.00", quantity=5, seller=cls.seller)
@@ -0,0 +1,34 @@
+import os
+from unittest import TestCase, mock
+
+from komercio.caches import cache_config, is_shared
+
+
+class TestCacheConfig(TestCase):
+    def test_defaults_to_local_memory(self):
+        print("test the cache falls back to a per-process local memory cache")
+
+        with mock.patch.dict(os.environ, clear=True):
+            config = cache_config()
+
+        self.assertEqual(config["BACKEND"], "django.core.cache.backends.locmem.LocMemCache")
+        self.assertFalse(is_shared(config))
+
+
+    def test_redis_url(self):
+        print("test CACHE_URL selects a shared redis cache")
+
+        with mock.patch.dict(os.environ, {"CACHE_URL": "redis://cache:6379/1"}):
+            config = cache_config()
+
+        self.assertEqual(config["BACKEND"], "django.core.cache.backends.redis.RedisCache")
+        self.assertEqual(config["LOCATION"], "redis://cache:6379/1")
+        self.assertTrue(is_shared(config))
+
+
+    def test_unknown_scheme(self):
+        print("test an unsupported CACHE_URL is rejected")
+
+        with mock.patch.dict(os.environ, {"CACHE_URL": "memcache://cache:11211"}):
+            with self.assertRaises(RuntimeError):
+                cache_config()
@@ -0,0 +1,112 @@
+import io
+import json
+from pathlib import Path
+
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from komercio.fixtures import iter_json_array
+from products.models import Product
+from users.models import Account
+
+
+class TestFixtureStreaming(APITestCase):
+    fixture_path = Path(__file__).resolve().parents[2] / "komercio.json"
+
+    def setUp(self) -> None:
+        cache.clear()
+
+
+    def test_load_fixture_matches_loaddata(self):
+        print("test load_fixture loads komercio.json like loaddata")
+
+        call_command("load_fixture", str(self.fixture_path), stdout=io.StringIO())
+        streamed = {
+            "accounts": list(Account.objects.order_by("id").values()),
+            "products": list(Product.objects.order_by("id").values()),
+        }
+
+        Product.objects.all().delete()
+        Account.objects.all().delete()
+        call_command("loaddata", str(self.fixture_path), stdout=io.StringIO())
+        loaded = {
+            "accounts": list(Account.objects.order_by("id").values()),
+            "products": list(Product.objects.order_by("id").values()),
+        }
+
+        self.assertEqual(len(streamed["accounts"]), 7)
+        self.assertEqual(len(streamed["products"]), 4)
+        self.assertEqual(streamed, loaded)
+
+
+    def test_load_fixture_updates_existing_rows(self):
+        print("test load_fixture overwrites rows that are already there")
+
+        call_command("load_fixture", str(self.fixture_path), stdout=io.StringIO())
+        product = Product.objects.first()
+        Product.objects.filter(id=product.id).update(description="changed")
+
+        call_command("load_fixture", str(self.fixture_path), stdout=io.StringIO())
+        product_after, = [obj for obj in json.loads(self.fixture_path.read_text()) if obj["pk"] == str(product.id)]
+
+        self.assertEqual(Account.objects.count(), 7)
+        self.assertEqual(Product.objects.count(), 4)
+        self.assertEqual(Product.objects.get(id=product.id).description, product_after["fields"]["description"])
+
+
+    def test_load_fixture_invalidates_loaded_rows(self):
+        print("test load_fixture bumps versions and drops cached details of the rows it overwrites")
+
+        call_command("load_fixture", str(self.fixture_path), stdout=io.StringIO())
+        product = Product.objects.first()
+        Product.objects.filter(id=product.id).update(description="changed", version=5)
+        detail_url = reverse("product-detail", kwargs={"pk": product.id})
+        cached_response = self.client.get(detail_url)
+
+        call_command("load_fixture", str(self.fixture_path), stdout=io.StringIO())
+        response = self.client.get(detail_url)
+
+        self.assertEqual(cached_response.data["description"], "changed")
+        self.assertNotEqual(response.data["description"], "changed")
+        self.assertNotEqual(response["ETag"], cached_response["ETag"])
+        self.assertEqual(Product.objects.get(id=product.id).version, 6)
+
+
+    def test_load_fixture_reports_conflicts(self):
+        print("test load_fixture reports rows that clash with other rows")
+
+        Account.objects.create_user(username="thor3", password="1234", first_name="thor3", last_name="odinson", is_seller=True)
+
+        with self.assertRaisesMessage(CommandError, "Fixture conflicts with existing rows"):
+            call_command("load_fixture", str(self.fixture_path), stdout=io.StringIO())
+
+        self.assertEqual(Account.objects.count(), 1)
+        self.assertEqual(Product.objects.count(), 0)
+
+
+    def test_dump_fixture_round_trip(self):
+        print("test dump_fixture output loads back unchanged")
+
+        call_command("load_fixture", str(self.fixture_path), stdout=io.StringIO())
+        output = io.StringIO()
+        call_command("dump_fixture", stdout=output, stderr=io.StringIO())
+
+        dumped = json.loads(output.getvalue())
+        original = json.loads(self.fixture_path.read_text())
+
+        self.assertEqual(
+            sorted((obj["model"], obj["pk"]) for obj in dumped),
+            sorted((obj["model"], obj["pk"]) for obj in original),
+        )
+        self.assertEqual([obj["model"] for obj in dumped[:7]], ["users.account"] * 7)
+
+
+    def test_stream_parser_handles_chunk_boundaries(self):
+        print("test the fixture parser reads objects split across chunks")
+
+        content = self.fixture_path.read_text()
+
+        self.assertEqual(list(iter_json_array(io.StringIO(content), chunk_size=7)), json.loads(content))
+        self.assertEqual(list(iter_json_array(io.StringIO("[]"))), [])
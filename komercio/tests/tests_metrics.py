@@ -0,0 +1,74 @@
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from prometheus_client import REGISTRY
+from rest_framework.views import status
+from unittest import mock
+
+from komercio.middleware import MetricsMiddleware
+from komercio.tests.base import SellerProductTestCase
+
+
+class TestMetrics(SellerProductTestCase):
+    def sample(self, name, **labels):
+        return REGISTRY.get_sample_value(name, labels) or 0
+
+
+    def test_records_route_metrics(self):
+        print("test requests are recorded per route")
+
+        labels = {"method": "GET", "route": "api/products/<pk>/"}
+        requests_before = self.sample("komercio_http_requests_total", status="200", **labels)
+        queries_before = self.sample("komercio_http_request_db_queries_sum", **labels)
+
+        with CaptureQueriesContext(connection) as captured:
+            self.client.get(reverse("product-detail", kwargs={"pk": self.product.id}))
+
+        self.assertEqual(self.sample("komercio_http_requests_total", status="200", **labels), requests_before + 1)
+        self.assertEqual(self.sample("komercio_http_request_db_queries_sum", **labels), queries_before + len(captured))
+        self.assertGreater(self.sample("komercio_http_response_size_bytes_sum", **labels), 0)
+
+        response = self.client.get(reverse("metrics"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn(b'komercio_http_requests_total{method="GET",route="api/products/<pk>/",status="200"}', response.content)
+
+
+    async def test_records_async_route_metrics(self):
+        print("test async requests are recorded without leaving the event loop")
+
+        labels = {"method": "GET", "route": "api/async/products/<pk>/"}
+        requests_before = self.sample("komercio_http_requests_total", status="200", **labels)
+        queries_before = self.sample("komercio_http_request_db_queries_sum", **labels)
+        acall = mock.patch.object(MetricsMiddleware, "__acall__", autospec=True, side_effect=MetricsMiddleware.__acall__)
+
+        with acall as recorded:
+            response = await self.async_client.get(reverse("async-product-detail", kwargs={"pk": self.product.id}))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(recorded.called)
+        self.assertEqual(self.sample("komercio_http_requests_total", status="200", **labels), requests_before + 1)
+        self.assertEqual(self.sample("komercio_http_request_db_queries_sum", **labels), queries_before + 1)
+
+
+    @override_settings(METRICS={"TOKEN": "s3cret", "ALLOWED_IPS": ["127.0.0.1"]})
+    def test_metrics_endpoint_requires_token(self):
+        print("test the metrics endpoint requires the token when one is set")
+
+        response = self.client.get(reverse("metrics"))
+        authorized_response = self.client.get(reverse("metrics"), HTTP_AUTHORIZATION="Bearer s3cret")
+        non_ascii_response = self.client.get(reverse("metrics"), HTTP_AUTHORIZATION="Bearer sécret")
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(non_ascii_response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(authorized_response.status_code, status.HTTP_200_OK)
+
+
+    @override_settings(METRICS={"TOKEN": None, "ALLOWED_IPS": ["10.0.0.1"]})
+    def test_metrics_endpoint_hidden_from_other_hosts(self):
+        print("test the metrics endpoint is hidden from hosts outside the allow list")
+
+        response = self.client.get(reverse("metrics"))
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,95 @@
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.views import status
+from unittest import mock
+
+from komercio.pagination import get_count
+from komercio.tests.base import SellerProductTestCase
+from products.models import Product
+
+
+@override_settings(PAGINATION_COUNT={"CACHE_ALIAS": "default", "TTL": 60, "THRESHOLD": 2})
+class TestCachedCountPagination(SellerProductTestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        super().setUpTestData()
+
+        Product.objects.create(description="product 1", price="10.00", quantity=1, seller=cls.seller)
+
+        cls.base_url = reverse("product-view")
+
+    def count_queries(self, captured):
+        return sum("COUNT(" in query["sql"].upper() for query in captured.captured_queries)
+
+
+    def test_large_count_is_cached(self):
+        print("test a count above the threshold is cached and flagged approximate")
+
+        first_response = self.client.get(self.base_url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Product.objects.create(description="product 2", price="10.00", quantity=1, seller=self.seller)
+
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(self.base_url)
+
+        self.assertEqual(first_response.data["count"], 2)
+        self.assertFalse(first_response.data["count_approximate"])
+        self.assertEqual(response.data["count"], 2)
+        self.assertTrue(response.data["count_approximate"])
+        self.assertEqual(self.count_queries(captured), 0)
+
+
+    def test_approximate_count_pages_by_rows(self):
+        print("test pages past a stale count are still reachable")
+
+        self.client.get(self.base_url)
+        with self.captureOnCommitCallbacks(execute=True):
+            Product.objects.create(description="product 2", price="10.00", quantity=1, seller=self.seller)
+
+        first_page = self.client.get(self.base_url)
+        last_page = self.client.get(first_page.data["next"])
+        missing_page = self.client.get(self.base_url, {"page": 3})
+
+        self.assertIsNotNone(first_page.data["next"])
+        self.assertEqual(len(last_page.data["results"]), 1)
+        self.assertIsNone(last_page.data["next"])
+        self.assertEqual(missing_page.status_code, status.HTTP_404_NOT_FOUND)
+
+
+    def test_small_count_is_exact(self):
+        print("test a count below the threshold is always exact")
+
+        queryset = Product.objects.filter(price__lt=5)
+
+        for _ in range(2):
+            with self.assertNumQueries(1):
+                self.assertEqual(get_count(queryset), (0, False))
+
+
+    def test_small_count_skips_planner_estimate(self):
+        print("test a recent small count is counted again without a planner estimate")
+
+        queryset = Product.objects.filter(price__lt=5)
+
+        with mock.patch("komercio.pagination.estimate_count", return_value=0) as estimate:
+            for _ in range(2):
+                with self.assertNumQueries(1):
+                    self.assertEqual(get_count(queryset), (0, False))
+
+        self.assertEqual(estimate.call_count, 1)
+
+
+    def test_planner_estimate_replaces_count(self):
+        print("test a large planner estimate is used instead of counting")
+
+        with mock.patch("komercio.pagination.estimate_count", return_value=50000):
+            with CaptureQueriesContext(connection) as captured:
+                response = self.client.get(self.base_url)
+
+        self.assertEqual(response.data["count"], 50000)
+        self.assertTrue(response.data["count_approximate"])
+        self.assertEqual(self.count_queries(captured), 0)
+        self.assertIsNone(response.data["next"])
@@ -0,0 +1,150 @@
+import json
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.base import BaseHandler
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.views import status
+
+from komercio.tests.base import SellerProductTestCase
+
+
+class TestProfiling(SellerProductTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+        settings_override = override_settings(
+            PROFILING={"TOKEN": "s3cret", "SAMPLE_RATE": 0, "DIRECTORY": directory.name, "FORMAT": "pstats", "MAX_FILES": 3}
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+
+    def test_profiles_authorized_request(self):
+        print("test a request can be profiled as speedscope")
+
+        response = self.client.get(
+            reverse("product-detail", kwargs={"pk": self.product.id}), HTTP_X_PROFILE="s3cret", HTTP_X_PROFILE_FORMAT="speedscope"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        profile = json.loads((self.directory / response["X-Profile-Id"]).read_text())
+        frames = profile["shared"]["frames"]
+        cpu, sql = profile["profiles"]
+        sampled_frames = {index for stack in cpu["samples"] for index in stack}
+        view_frames = [
+            index for index, frame in enumerate(frames)
+            if frame["name"] == "retrieve" and frame.get("file", "").endswith(str(Path("products", "views.py")))
+        ]
+
+        self.assertTrue(response["X-Profile-Id"].endswith(".speedscope.json"))
+        self.assertEqual(len(view_frames), 1)
+        self.assertIn(view_frames[0], sampled_frames)
+        self.assertEqual(len(cpu["samples"]), len(cpu["weights"]))
+        self.assertGreater(len(sql["events"]), 0)
+        self.assertIn("SELECT", frames[sql["events"][0]["frame"]]["name"])
+
+
+    async def test_profiles_async_request(self):
+        print("test an async request is profiled on the event loop")
+
+        response = await self.async_client.get(
+            reverse("async-product-detail", kwargs={"pk": self.product.id}), **{"X-Profile": "s3cret", "X-Profile-Format": "speedscope"}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        profile = json.loads((self.directory / response["X-Profile-Id"]).read_text())
+        view_frames = [
+            frame for frame in profile["shared"]["frames"]
+            if frame["name"] == "get" and frame.get("file", "").endswith(str(Path("products", "async_views.py")))
+        ]
+
+        self.assertEqual(len(view_frames), 1)
+        self.assertGreater(len(profile["profiles"][1]["events"]), 0)
+
+
+    def test_middleware_chain_stays_async(self):
+        print("test the middleware chain is not adapted to sync under ASGI")
+
+        with mock.patch("django.core.handlers.base.sync_to_async", wraps=sync_to_async) as adapted:
+            BaseHandler().load_middleware(is_async=True)
+
+        # Only Django's own sync process_view() hooks may be wrapped.
+        self.assertEqual({call.args[0].__name__ for call in adapted.call_args_list}, {"process_view"})
+
+
+    def test_profiles_as_pstats(self):
+        print("test requests are profiled as pstats by default")
+
+        response = self.client.get(reverse("product-detail", kwargs={"pk": self.product.id}), HTTP_X_PROFILE="s3cret")
+
+        path = self.directory / response["X-Profile-Id"]
+        queries = json.loads(path.with_suffix(".sql.json").read_text())
+
+        self.assertEqual(path.suffix, ".pstats")
+        self.assertGreater(len(queries), 0)
+
+
+    def test_skips_unauthorized_request(self):
+        print("test requests without the right token are not profiled")
+
+        wrong_token_response = self.client.get(reverse("product-view"), HTTP_X_PROFILE="wrong")
+        non_ascii_response = self.client.get(reverse("product-view"), HTTP_X_PROFILE="sécret")
+        no_header_response = self.client.get(reverse("product-view"))
+
+        self.assertNotIn("X-Profile-Id", wrong_token_response)
+        self.assertEqual(non_ascii_response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("X-Profile-Id", non_ascii_response)
+        self.assertNotIn("X-Profile-Id", no_header_response)
+        self.assertEqual(list(self.directory.iterdir()), [])
+
+
+    def test_samples_requests(self):
+        print("test the sample rate profiles requests without the header")
+
+        with override_settings(PROFILING={**settings.PROFILING, "TOKEN": None, "SAMPLE_RATE": 1.0}):
+            response = self.client.get(reverse("product-view"))
+
+        self.assertIn("X-Profile-Id", response)
+
+
+    def test_keeps_newest_files(self):
+        print("test old profiles are pruned past MAX_FILES")
+
+        for _ in range(5):
+            self.client.get(reverse("product-view"), HTTP_X_PROFILE="s3cret")
+
+        self.assertEqual(len(list(self.directory.iterdir())), 3)
+
+
+    def test_downloads_profile(self):
+        print("test profiles are listed and downloaded with the token only")
+
+        profile_id = self.client.get(reverse("product-view"), HTTP_X_PROFILE="s3cret")["X-Profile-Id"]
+
+        list_response = self.client.get(reverse("profile-list"), HTTP_X_PROFILE="s3cret")
+        download_response = self.client.get(reverse("profile-download", kwargs={"name": profile_id}), HTTP_X_PROFILE="s3cret")
+        unauthorized_response = self.client.get(reverse("profile-download", kwargs={"name": profile_id}))
+        traversal_response = self.client.get(reverse("profile-download", kwargs={"name": "..settings.py"}), HTTP_X_PROFILE="s3cret")
+
+        self.assertIn(profile_id, list_response.json()["profiles"])
+        self.assertEqual(len(list(self.directory.iterdir())), 2)
+        self.assertEqual(download_response.status_code, status.HTTP_200_OK)
+        self.assertGreater(len(b"".join(download_response.streaming_content)), 0)
+        self.assertEqual(unauthorized_response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(traversal_response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+    @override_settings(PROFILING={"TOKEN": None, "SAMPLE_RATE": 0, "DIRECTORY": "", "FORMAT": "speedscope", "MAX_FILES": 1})
+    def test_disabled_profiler_is_not_installed(self):
+        print("test the profiling middleware drops out when disabled")
+
+        response = self.client.get(reverse("product-view"), HTTP_X_PROFILE="s3cret")
+
+        self.assertNotIn("X-Profile-Id", response)
@@ -0,0 +1,69 @@
+from decimal import Decimal
+
+from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+
+from komercio.fast_serializers import get_values_serializer
+from komercio.renderers import FastJSONRenderer
+from komercio.tests.base import SellerProductTestCase
+from products.models import Product
+from products.serializers import ProductSerializerGeneral
+from users.models import Account
+from users.serializers import AccountSerializer
+
+
+class TestFastListSerialization(SellerProductTestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        super().setUpTestData()
+
+        Account.objects.create_user(**{**cls.account_data, "username": "odin", "is_seller": False})
+
+        for price in ("0.99", "1234.50"):
+            Product.objects.create(description=f"product {price}", price=price, quantity=1, seller=cls.seller)
+
+
+    def assert_identical_json(self, serializer_class, queryset):
+        values_serializer = get_values_serializer(serializer_class)
+
+        expected = JSONRenderer().render(serializer_class(queryset, many=True).data)
+        result = JSONRenderer().render(values_serializer.serialize(values_serializer.values(queryset)))
+
+        self.assertEqual(result, expected)
+
+
+    def test_fast_path_matches_product_serializer(self):
+        print("test fast path renders the same json as the product serializer")
+
+        self.assert_identical_json(ProductSerializerGeneral, Product.objects.order_by("price"))
+
+
+    def test_fast_path_matches_account_serializer(self):
+        print("test fast path renders the same json as the account serializer")
+
+        self.assert_identical_json(AccountSerializer, Account.objects.order_by("username"))
+
+
+class TestFastJSONRenderer(APITestCase):
+    def test_fast_renderer_matches_default_renderer(self):
+        print("test fast json renderer matches the default renderer")
+
+        account = Account(username="cloud", first_name="cloud", last_name="thorson", is_seller=True)
+        payload = {
+            "id": account.id,
+            "date_joined": account.date_joined,
+            "price": Decimal("10.99"),
+            "description": "Smartband \u2028 pulseira inteligente",
+            "results": [{"quantity": 1, "is_active": True, "seller_id": None}],
+        }
+
+        self.assertEqual(FastJSONRenderer().render(payload), JSONRenderer().render(payload))
+
+
+    def test_products_are_rendered_with_fast_renderer(self):
+        print("test products are rendered with the fast renderer")
+
+        response = self.client.get(reverse("product-view"))
+
+        self.assertIsInstance(response.accepted_renderer, FastJSONRenderer)
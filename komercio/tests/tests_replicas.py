@@ -0,0 +1,150 @@
+import time
+
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from rest_framework.views import status
+from unittest import mock
+
+from komercio.middleware import ReplicaRoutingMiddleware
+from komercio.tests.base import SellerProductTestCase
+from products.cache import (
+    BULK_WRITE_GENERATION,
+    account_generation,
+    bump_generations,
+    get_cached_response,
+    product_generation,
+)
+from users.models import Account
+
+
+@override_settings(DATABASE_REPLICAS=["default"])
+class TestReplicaRouting(SellerProductTestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        super().setUpTestData()
+
+        buyer_account = Account.objects.create_user(
+            username="krun", password="1234", first_name="krun", last_name="demno", is_seller=False
+        )
+        cls.buyer_token = Token.objects.create(user=buyer_account)
+
+        cls.list_url = reverse("product-view")
+        cls.reserve_url = reverse("product-reserve")
+
+    def setUp(self) -> None:
+        super().setUp()
+        # The "replica" is the default database itself, so only the routing
+        # decision is observed here.
+        patcher = mock.patch("komercio.routers.random.choice", side_effect=lambda aliases: aliases[0])
+        self.choose_replica = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def reserve(self, client):
+        return client.post(self.reserve_url, {"id": str(self.product.id), "quantity": 1}, format="json")
+
+    def settle_generations(self):
+        # Stamp the cached data as older than any replication lag.
+        with mock.patch("products.cache.time.time", return_value=time.time() - 3600):
+            bump_generations(
+                "products", BULK_WRITE_GENERATION, product_generation(self.product.id), account_generation(self.seller.id)
+            )
+
+
+    def test_reads_go_to_replica(self):
+        print("test safe-method reads go to a replica")
+
+        self.settle_generations()
+        response = self.client.get(self.list_url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(self.choose_replica.called)
+
+
+    def test_writes_go_to_primary(self):
+        print("test writes are never routed to a replica")
+
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + self.buyer_token.key)
+        response = self.reserve(self.client)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(self.choose_replica.called)
+
+
+    def test_client_reads_its_writes_from_primary(self):
+        print("test a client that wrote reads from the primary")
+
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + self.buyer_token.key)
+        self.reserve(self.client)
+        response = self.client.get(self.list_url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(self.choose_replica.called)
+
+
+    def test_token_pins_client_without_cookies(self):
+        print("test a token that wrote is pinned even without the cookie")
+
+        writer = APIClient()
+        writer.credentials(HTTP_AUTHORIZATION="Token " + self.buyer_token.key)
+        self.reserve(writer)
+
+        reader = APIClient()
+        reader.credentials(HTTP_AUTHORIZATION="Token " + self.buyer_token.key)
+        reader.get(self.list_url)
+
+        self.assertFalse(self.choose_replica.called)
+
+        cache.clear()
+        self.settle_generations()
+        APIClient().get(self.list_url)
+
+        self.assertTrue(self.choose_replica.called)
+
+
+    def test_recent_writes_are_not_cached_from_replica(self):
+        print("test responses for recently changed data are rebuilt from the primary")
+
+        self.settle_generations()
+        detail_url = reverse("product-detail", kwargs={"pk": self.product.id})
+        self.client.get(detail_url)
+        self.choose_replica.reset_mock()
+
+        writer = APIClient()
+        writer.credentials(HTTP_AUTHORIZATION="Token " + self.buyer_token.key)
+        self.reserve(writer)
+
+        response = APIClient().get(detail_url)
+
+        self.assertEqual(response.data["quantity"], 4)
+        self.assertFalse(self.choose_replica.called)
+
+
+    def test_recent_seller_change_is_not_cached_from_replica(self):
+        print("test a response read from a replica is not cached while its seller changes replicate")
+
+        self.settle_generations()
+        bump_generations(account_generation(self.seller.id))
+        detail_url = reverse("product-detail", kwargs={"pk": self.product.id})
+
+        APIClient().get(detail_url)
+
+        self.assertTrue(self.choose_replica.called)
+        self.assertIsNone(get_cached_response(f"testserver{detail_url}?"))
+
+
+    async def test_routes_async_requests_natively(self):
+        print("test async requests are routed without leaving the event loop")
+
+        acall = mock.patch.object(
+            ReplicaRoutingMiddleware, "__acall__", autospec=True, side_effect=ReplicaRoutingMiddleware.__acall__
+        )
+
+        with acall as routed:
+            response = await self.async_client.get(reverse("async-product-view"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(routed.called)
+        self.assertTrue(self.choose_replica.called)
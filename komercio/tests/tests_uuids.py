@@ -0,0 +1,75 @@
+import io
+import uuid
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+from rest_framework.views import status
+
+from komercio.tests.base import ACCOUNT_DATA
+from products.models import Product
+from users.authentication import CachedTokenAuthentication
+from users.models import Account
+
+
+class TestTimeOrderedPrimaryKeys(APITestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.account_data = ACCOUNT_DATA
+
+
+    def test_new_rows_get_increasing_keys(self):
+        print("test new rows get time-ordered primary keys")
+
+        seller = Account.objects.create_user(**self.account_data)
+        products = [
+            Product.objects.create(description=f"product {index}", price="10.00", quantity=1, seller=seller)
+            for index in range(5)
+        ]
+
+        self.assertEqual(seller.id.version, 7)
+        self.assertEqual([product.id for product in products], sorted(product.id for product in products))
+
+
+    def test_rekey_existing_rows(self):
+        print("test rekeying uuid4 rows keeps relations and join order")
+
+        older = Account.objects.create_user(**{**self.account_data, "username": "older"}, id=uuid.uuid4())
+        newer = Account.objects.create_user(**self.account_data, id=uuid.uuid4())
+        Account.objects.filter(pk=older.pk).update(date_joined=newer.date_joined - timedelta(days=1))
+        token = Token.objects.create(user=newer)
+        product = Product.objects.create(description="Smartband XYZ", price="10.00", quantity=1, seller=newer, id=uuid.uuid4())
+
+        call_command("rekey_uuid7", "accounts", "products", stdout=io.StringIO())
+
+        accounts = list(Account.objects.order_by("id"))
+        product = Product.objects.get(description="Smartband XYZ")
+
+        self.assertEqual([account.username for account in accounts], ["older", "cloud"])
+        self.assertTrue(all(account.id.version == 7 for account in accounts))
+        self.assertEqual(product.id.version, 7)
+        self.assertEqual(product.seller.username, "cloud")
+        self.assertEqual(Token.objects.get(key=token.key).user.username, "cloud")
+        self.assertEqual(accounts[1].products.count(), 1)
+
+
+    def test_rekey_invalidates_cached_tokens_and_responses(self):
+        print("test rekeying drops cached tokens and responses that hold the old keys")
+
+        seller = Account.objects.create_user(**self.account_data, id=uuid.uuid4())
+        token = Token.objects.create(user=seller)
+        product = Product.objects.create(description="Smartband XYZ", price="10.00", quantity=1, seller=seller, id=uuid.uuid4())
+        old_detail_url = reverse("product-detail", kwargs={"pk": product.id})
+
+        CachedTokenAuthentication().authenticate_credentials(token.key)
+        self.client.get(old_detail_url)
+
+        call_command("rekey_uuid7", "accounts", "products", stdout=io.StringIO())
+
+        user, _ = CachedTokenAuthentication().authenticate_credentials(token.key)
+
+        self.assertEqual(user.id, Account.objects.get().id)
+        self.assertEqual(self.client.get(old_detail_url).status_code, status.HTTP_404_NOT_FOUND)
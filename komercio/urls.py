@@ -20,10 +20,16 @@ from drf_spectacular.views import (
     SpectacularSwaggerView,
 )
 
+from komercio.metrics import metrics_view
+from komercio.profiling import profile_download_view, profile_list_view
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', include('users.urls')),
     path('api/', include('products.urls')),
     path('schema', SpectacularAPIView.as_view(), name='schema'),
-    path('api/swagger-doc/', SpectacularSwaggerView.as_view(url_name="schema"))
+    path('api/swagger-doc/', SpectacularSwaggerView.as_view(url_name="schema")),
+    path('metrics/', metrics_view, name='metrics'),
+    path('profiles/', profile_list_view, name='profile-list'),
+    path('profiles/<str:name>/', profile_download_view, name='profile-download'),
 ]
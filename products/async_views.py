@@ -0,0 +1,22 @@
+from django.core.exceptions import ValidationError
+from django.views import View
+
+from komercio.async_views import AsyncListView, render_json
+
+from .models import Product
+from .serializers import ProductSerializerDetailed, ProductSerializerGeneral
+
+
+class AsyncProductView(AsyncListView):
+    queryset = Product.objects.all()
+    serializer_class = ProductSerializerGeneral
+
+
+class AsyncProductDetailView(View):
+    async def get(self, request, pk):
+        try:
+            product = await Product.objects.select_related('seller').aget(pk=pk)
+        except (Product.DoesNotExist, ValidationError):
+            return render_json({'detail': 'Not found.'}, status=404)
+
+        return render_json(ProductSerializerDetailed(product).data)
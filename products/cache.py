@@ -0,0 +1,91 @@
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.utils.encoders import JSONEncoder
+
+from users.serializers import AccountSerializer
+
+
+GENERATION_PREFIX = 'generation:'
+RESPONSE_PREFIX = 'response:'
+
+# Bumped by commands that write rows without the post_save signals. Every
+# cached response depends on it, so one bump invalidates them all.
+BULK_WRITE_GENERATION = 'bulk-write'
+
+
+def get_response_cache():
+    return caches[settings.RESPONSE_CACHE['CACHE_ALIAS']]
+
+
+def product_generation(pk):
+    return f'product:{pk}'
+
+
+def account_generation(pk):
+    return f'account:{pk}'
+
+
+def get_generations(names):
+    cache = get_response_cache()
+    keys = {GENERATION_PREFIX + name: name for name in names}
+    generations = {keys[key]: value for key, value in cache.get_many(keys).items()}
+    missing = {key: time.time() for key, name in keys.items() if name not in generations}
+
+    if missing:
+        cache.set_many(missing, None)
+        generations.update({keys[key]: value for key, value in missing.items()})
+
+    return generations
+
+
+def bump_generations(*names):
+    now = time.time()
+    get_response_cache().set_many({GENERATION_PREFIX + name: now for name in names}, None)
+
+
+def bump_bulk_write_generation():
+    bump_generations(BULK_WRITE_GENERATION)
+
+
+def make_etag(data):
+    content = json.dumps(data, cls=JSONEncoder, sort_keys=True).encode()
+    return '"%s"' % hashlib.md5(content).hexdigest()
+
+
+def product_etag(product):
+    seller_state = [
+        getattr(product.seller, field)
+        for field in AccountSerializer.Meta.fields
+        if field not in AccountSerializer.Meta.extra_kwargs
+    ]
+    digest = hashlib.md5(repr(seller_state).encode()).hexdigest()
+
+    return f'"{product.pk}-{product.version}-{digest}"'
+
+
+def get_cached_response(key):
+    entry = get_response_cache().get(RESPONSE_PREFIX + key)
+
+    if entry is None:
+        return None
+
+    if get_generations(entry['generations']) != entry['generations']:
+        return None
+
+    return entry
+
+
+def set_cached_response(key, data, generations, etag):
+    entry = {
+        'data': data,
+        'etag': etag,
+        'last_modified': max(generations.values()),
+        'generations': generations,
+    }
+    get_response_cache().set(RESPONSE_PREFIX + key, entry, settings.RESPONSE_CACHE['TTL'])
+
+    return entry
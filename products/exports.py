@@ -0,0 +1,41 @@
+import csv
+import json
+
+
+EXPORT_FIELDS = ['id', 'seller_id', 'description', 'price', 'quantity', 'is_active']
+
+
+class Echo:
+    def write(self, value):
+        return value
+
+
+def export_row(row):
+    return {
+        'id': str(row['id']),
+        'seller_id': str(row['seller_id']),
+        'description': row['description'],
+        'price': str(row['price']),
+        'quantity': row['quantity'],
+        'is_active': row['is_active'],
+    }
+
+
+def stream_ndjson(rows):
+    for row in rows:
+        yield json.dumps(export_row(row)) + '\n'
+
+
+def stream_csv(rows):
+    writer = csv.DictWriter(Echo(), fieldnames=EXPORT_FIELDS)
+
+    yield writer.writeheader()
+
+    for row in rows:
+        yield writer.writerow(export_row(row))
+
+
+EXPORT_FORMATS = {
+    'ndjson': (stream_ndjson, 'application/x-ndjson'),
+    'csv': (stream_csv, 'text/csv'),
+}
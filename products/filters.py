@@ -0,0 +1,51 @@
+import uuid
+from decimal import Decimal, InvalidOperation
+
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+
+def parse_boolean(name, value):
+    if value.lower() in ('true', '1'):
+        return True
+
+    if value.lower() in ('false', '0'):
+        return False
+
+    raise ValidationError({name: ["Must be a valid boolean."]})
+
+
+def parse_decimal(name, value):
+    try:
+        return Decimal(value)
+    except InvalidOperation:
+        raise ValidationError({name: ["A valid number is required."]})
+
+
+def parse_uuid(name, value):
+    try:
+        return uuid.UUID(value)
+    except ValueError:
+        raise ValidationError({name: ["Must be a valid UUID."]})
+
+
+class ProductFilterBackend(BaseFilterBackend):
+    def filter_queryset(self, request, queryset, view):
+        params = request.query_params
+
+        if 'seller' in params:
+            queryset = queryset.filter(seller_id=parse_uuid('seller', params['seller']))
+
+        if 'is_active' in params:
+            queryset = queryset.filter(is_active=parse_boolean('is_active', params['is_active']))
+
+        if 'in_stock' in params and parse_boolean('in_stock', params['in_stock']):
+            queryset = queryset.filter(quantity__gt=0)
+
+        if 'min_price' in params:
+            queryset = queryset.filter(price__gte=parse_decimal('min_price', params['min_price']))
+
+        if 'max_price' in params:
+            queryset = queryset.filter(price__lte=parse_decimal('max_price', params['max_price']))
+
+        return queryset
@@ -0,0 +1,65 @@
+import time
+from wsgiref.util import setup_testing_defaults
+
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure requests/sec through the full WSGI stack with per-request database "
+        "connections versus the configured persistent connections."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default='/api/accounts/')
+        parser.add_argument('--requests', type=int, default=500)
+        parser.add_argument(
+            '--conn-max-age',
+            type=int,
+            help='Lifetime for the persistent run. Defaults to the configured CONN_MAX_AGE, or 60 if that is 0.',
+        )
+
+    def run(self, handler, path, requests):
+        def start_response(status, headers):
+            assert status.startswith('200'), status
+
+        started = time.perf_counter()
+
+        for _ in range(requests):
+            environ = {'PATH_INFO': path, 'HTTP_HOST': 'localhost'}
+            setup_testing_defaults(environ)
+            response = handler(environ, start_response)
+            b''.join(response)
+            # Closing the response fires request_finished, which is where
+            # Django closes or keeps the connection.
+            response.close()
+
+        return requests / (time.perf_counter() - started)
+
+    def handle(self, *args, **options):
+        handler = WSGIHandler()
+        configured = {connection.alias: connection.settings_dict['CONN_MAX_AGE'] for connection in connections.all()}
+        persistent = options['conn_max_age']
+        if persistent is None:
+            persistent = 60 if configured['default'] == 0 else configured['default']
+        modes = {
+            'per-request connections (CONN_MAX_AGE=0)': 0,
+            f'persistent connections (CONN_MAX_AGE={persistent})': persistent,
+        }
+
+        try:
+            for label, conn_max_age in modes.items():
+                for connection in connections.all():
+                    connection.close()
+                    connection.settings_dict['CONN_MAX_AGE'] = conn_max_age
+
+                # Warm up URL resolution, imports and caches outside the measurement.
+                self.run(handler, options['path'], 10)
+                throughput = self.run(handler, options['path'], options['requests'])
+                self.stdout.write(f'{label}: {throughput:.0f} req/s')
+        finally:
+            for connection in connections.all():
+                connection.close()
+                connection.settings_dict['CONN_MAX_AGE'] = configured[connection.alias]
@@ -0,0 +1,179 @@
+import json
+import random
+import statistics
+import time
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, setup_test_environment
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.settings import api_settings
+from rest_framework.test import APIClient
+
+from products.cache import bump_generations
+from products.models import Product
+from products.search import search_index
+from users.authentication import token_cache
+from users.models import Account
+from users.newest import invalidate_newest_accounts
+
+
+SCENARIOS = ['product-list', 'product-detail', 'product-create', 'login', 'account-update']
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive the real endpoints in-process against the current database (see generate_data) and "
+        "report p50/p95/p99 latency, throughput and queries per request. Writes are rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200)
+        parser.add_argument('--warmup', type=int, default=10)
+        parser.add_argument('--scenario', action='append', choices=SCENARIOS, dest='scenarios')
+        parser.add_argument(
+            '--cold-cache',
+            action='store_true',
+            help=(
+                'Clear the whole cache and the in-process token cache before every request. '
+                'Do not use against a shared cache.'
+            ),
+        )
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--json', dest='json_output', help='Also write the results to this file.')
+        parser.add_argument('--compare', help='Fail if p95 regresses against a previous --json file.')
+        parser.add_argument('--tolerance', type=float, default=0.2)
+
+    def setup(self):
+        self.password = 'benchmark-password'
+        self.account = Account.objects.create_user(
+            username='benchmark-endpoints',
+            password=self.password,
+            first_name='benchmark',
+            last_name='benchmark',
+            is_seller=True,
+        )
+        self.token = Token.objects.create(user=self.account)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token.key)
+
+        product_ids = list(Product.objects.order_by('id').values_list('id', flat=True)[:5000])
+
+        if not product_ids:
+            raise CommandError('No products to benchmark. Run generate_data first.')
+
+        self.product_ids = random.Random(0).sample(product_ids, min(len(product_ids), 1000))
+        self.pages = max(len(product_ids) // api_settings.PAGE_SIZE, 1)
+
+    def product_list(self, rng):
+        return self.client.get(reverse('product-view'), {'page': rng.randrange(1, self.pages + 1)})
+
+    def product_detail(self, rng):
+        return self.client.get(reverse('product-detail', kwargs={'pk': rng.choice(self.product_ids)}))
+
+    def product_create(self, rng):
+        data = {'description': f'benchmark product {rng.random()}', 'price': '10.00', 'quantity': 5}
+        return self.client.post(reverse('product-view'), data, format='json')
+
+    def login(self, rng):
+        data = {'username': self.account.username, 'password': self.password}
+        return APIClient().post(reverse('login'), data, format='json')
+
+    def account_update(self, rng):
+        url = reverse('account-update', kwargs={'pk': self.account.id})
+        return self.client.patch(url, {'first_name': f'benchmark {rng.randrange(1000)}'}, format='json')
+
+    def run_scenario(self, name, options):
+        request = getattr(self, name.replace('-', '_'))
+        rng = random.Random(options['seed'])
+        latencies = []
+        queries = []
+
+        for index in range(options['warmup'] + options['requests']):
+            if options['cold_cache']:
+                cache.clear()
+                token_cache.clear()
+
+            with CaptureQueriesContext(connection) as captured:
+                started = time.perf_counter()
+                response = request(rng)
+                elapsed = time.perf_counter() - started
+
+            if response.status_code >= 400:
+                raise CommandError(f'{name} returned {response.status_code}: {response.content[:200]!r}')
+
+            if index >= options['warmup']:
+                latencies.append(elapsed * 1000)
+                queries.append(len(captured))
+
+        percentiles = statistics.quantiles(latencies, n=100, method='inclusive')
+
+        return {
+            'p50_ms': round(percentiles[49], 3),
+            'p95_ms': round(percentiles[94], 3),
+            'p99_ms': round(percentiles[98], 3),
+            'requests_per_second': round(len(latencies) / (sum(latencies) / 1000), 1),
+            'queries_per_request': round(statistics.mean(queries), 2),
+        }
+
+    def compare(self, results, baseline_path, tolerance):
+        with open(baseline_path, encoding='utf-8') as baseline_file:
+            baseline = json.load(baseline_file)
+
+        regressions = [
+            f"{name}: p95 {result['p95_ms']} ms vs {baseline[name]['p95_ms']} ms"
+            for name, result in results.items()
+            if name in baseline and result['p95_ms'] > baseline[name]['p95_ms'] * (1 + tolerance)
+        ]
+        regressions += [
+            f"{name}: {result['queries_per_request']} queries/request vs {baseline[name]['queries_per_request']}"
+            for name, result in results.items()
+            if name in baseline and result['queries_per_request'] > baseline[name]['queries_per_request']
+        ]
+
+        if regressions:
+            raise CommandError('Performance regressions:\n' + '\n'.join(regressions))
+
+    def handle(self, *args, **options):
+        if options['requests'] < 2:
+            raise CommandError('--requests must be at least 2 to compute percentiles.')
+
+        try:
+            setup_test_environment()
+        except RuntimeError:
+            # Already set up, e.g. when run from the test suite.
+            pass
+
+        results = {}
+
+        try:
+            with transaction.atomic():
+                self.setup()
+
+                for name in options['scenarios'] or SCENARIOS:
+                    results[name] = result = self.run_scenario(name, options)
+                    self.stdout.write(
+                        f"{name}: p50 {result['p50_ms']:.2f} ms, p95 {result['p95_ms']:.2f} ms, "
+                        f"p99 {result['p99_ms']:.2f} ms, {result['requests_per_second']:.0f} req/s, "
+                        f"{result['queries_per_request']:.1f} queries/request"
+                    )
+
+                transaction.set_rollback(True)
+        finally:
+            # Cached responses built during the run may include rolled-back
+            # writes, and the benchmark token no longer exists.
+            bump_generations('products')
+            invalidate_newest_accounts()
+            search_index.clear()
+
+            if hasattr(self, 'token'):
+                token_cache.delete(self.token.key)
+
+        if options['json_output']:
+            with open(options['json_output'], 'w', encoding='utf-8') as output:
+                json.dump(results, output, indent=2)
+
+        if options['compare']:
+            self.compare(results, options['compare'], options['tolerance'])
@@ -0,0 +1,80 @@
+import io
+import time
+import uuid
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from komercio.parsers import FastJSONParser
+from komercio.renderers import FastJSONRenderer
+
+
+class Command(BaseCommand):
+    help = "Micro-benchmark the default and fast JSON renderer/parser over product and account payloads."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100)
+        parser.add_argument('--rounds', type=int, default=500)
+
+    def make_payloads(self, rows):
+        seller = {
+            'id': uuid.uuid4(),
+            'username': 'cloud',
+            'first_name': 'cloud',
+            'last_name': 'thorson',
+            'is_seller': True,
+            'date_joined': timezone.now(),
+            'is_active': True,
+            'is_superuser': False,
+        }
+        products = [
+            {
+                'id': uuid.uuid4(),
+                'seller': seller,
+                'description': f'Smartband XYZ {index} — pulseira inteligente',
+                'price': Decimal('100.99'),
+                'quantity': index,
+                'is_active': True,
+            }
+            for index in range(rows)
+        ]
+        accounts = [{**seller, 'id': uuid.uuid4(), 'username': f'account {index}'} for index in range(rows)]
+
+        return {
+            'product page': {'count': rows, 'next': None, 'previous': None, 'results': products},
+            'account page': {'count': rows, 'next': None, 'previous': None, 'results': accounts},
+        }
+
+    def measure(self, function, rounds):
+        started = time.perf_counter()
+
+        for _ in range(rounds):
+            function()
+
+        return rounds / (time.perf_counter() - started)
+
+    def handle(self, *args, **options):
+        rounds = options['rounds']
+
+        for label, payload in self.make_payloads(options['rows']).items():
+            content = JSONRenderer().render(payload)
+
+            rates = {
+                'render': [
+                    self.measure(lambda: renderer.render(payload), rounds)
+                    for renderer in (JSONRenderer(), FastJSONRenderer())
+                ],
+                'parse': [
+                    self.measure(lambda: parser.parse(io.BytesIO(content)), rounds)
+                    for parser in (JSONParser(), FastJSONParser())
+                ],
+            }
+
+            for operation, (default_rate, fast_rate) in rates.items():
+                self.stdout.write(
+                    f'{label} {operation}: default {default_rate:,.0f}/sec, '
+                    f'fast {fast_rate:,.0f}/sec ({fast_rate / default_rate:.1f}x)'
+                )
@@ -0,0 +1,79 @@
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import connection, models, transaction
+
+from komercio.uuids import uuid7
+
+
+KEY_FACTORIES = {
+    'uuid4': uuid.uuid4,
+    'uuid7': uuid7,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Insert rows keyed by uuid4 and by uuid7 into scratch tables and report insert throughput "
+        "and primary key index size. The tables are dropped afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=200000)
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def index_size(self, cursor, table):
+        if connection.vendor == 'postgresql':
+            cursor.execute('SELECT pg_relation_size(%s)', [f'{table}_pkey'])
+            return cursor.fetchone()[0]
+
+        if connection.vendor == 'sqlite':
+            cursor.execute(
+                'SELECT SUM(pgsize) FROM dbstat WHERE name = %s',
+                [f'sqlite_autoindex_{table}_1'],
+            )
+            return cursor.fetchone()[0]
+
+        return None
+
+    def measure(self, cursor, table, make_key, rows, batch_size):
+        key_field = models.UUIDField()
+        key_type = key_field.db_type(connection)
+        quoted = connection.ops.quote_name(table)
+
+        cursor.execute(f'DROP TABLE IF EXISTS {quoted}')
+        cursor.execute(f'CREATE TABLE {quoted} (id {key_type} PRIMARY KEY, payload integer NOT NULL)')
+
+        try:
+            started = time.perf_counter()
+
+            for start in range(0, rows, batch_size):
+                batch = [
+                    (key_field.get_db_prep_value(make_key(), connection), number)
+                    for number in range(start, min(start + batch_size, rows))
+                ]
+
+                # One transaction per batch, as bulk_create would do. The raw
+                # DB-API cursor skips the DEBUG query log, which would
+                # otherwise dominate the timing.
+                with transaction.atomic():
+                    cursor.cursor.executemany(f'INSERT INTO {quoted} (id, payload) VALUES (%s, %s)', batch)
+
+            elapsed = time.perf_counter() - started
+
+            if connection.vendor == 'postgresql':
+                cursor.execute(f'ANALYZE {quoted}')
+
+            return rows / elapsed, self.index_size(cursor, table)
+        finally:
+            cursor.execute(f'DROP TABLE IF EXISTS {quoted}')
+
+    def handle(self, *args, **options):
+        with connection.cursor() as cursor:
+            for name, make_key in KEY_FACTORIES.items():
+                throughput, size = self.measure(
+                    cursor, f'benchmark_pk_{name}', make_key, options['rows'], options['batch_size']
+                )
+                size_label = f'{size / 1024 / 1024:.1f} MiB' if size is not None else 'n/a'
+                self.stdout.write(f'{name}: {throughput:.0f} rows/s, primary key index {size_label}')
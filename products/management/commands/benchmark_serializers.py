@@ -0,0 +1,73 @@
+import time
+import uuid
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from komercio.fast_serializers import get_values_serializer
+from products.models import Product
+from products.serializers import ProductSerializerGeneral
+from users.models import Account
+from users.serializers import AccountSerializer
+
+
+class Command(BaseCommand):
+    help = "Compare rows/sec of the list serializers against the values() fast path."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10000)
+
+    def make_accounts(self, rows):
+        return [
+            Account(
+                id=uuid.uuid4(),
+                username=f'account {index}',
+                first_name='first',
+                last_name='last',
+                is_seller=bool(index % 2),
+                date_joined=timezone.now(),
+            )
+            for index in range(rows)
+        ]
+
+    def make_products(self, rows):
+        seller_id = uuid.uuid4()
+
+        return [
+            Product(
+                id=uuid.uuid4(),
+                description=f'product {index}',
+                price=Decimal('10.99'),
+                quantity=index,
+                seller_id=seller_id,
+            )
+            for index in range(rows)
+        ]
+
+    def measure(self, serialize, items):
+        started = time.perf_counter()
+        serialize(items)
+
+        return len(items) / (time.perf_counter() - started)
+
+    def handle(self, *args, **options):
+        cases = {
+            'products': (ProductSerializerGeneral, self.make_products(options['rows'])),
+            'accounts': (AccountSerializer, self.make_accounts(options['rows'])),
+        }
+
+        for label, (serializer_class, instances) in cases.items():
+            values_serializer = get_values_serializer(serializer_class)
+            rows = [
+                {source: getattr(instance, source) for source in values_serializer.sources}
+                for instance in instances
+            ]
+
+            serializer_rate = self.measure(lambda items: serializer_class(items, many=True).data, instances)
+            fast_rate = self.measure(values_serializer.serialize, rows)
+
+            self.stdout.write(
+                f'{label}: serializer {serializer_rate:,.0f} rows/sec, '
+                f'fast path {fast_rate:,.0f} rows/sec ({fast_rate / serializer_rate:.1f}x)'
+            )
@@ -0,0 +1,39 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+from komercio.fixtures import dump_fixture, sort_models
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream models to a JSON fixture readable by loaddata and load_fixture, fetching rows in "
+        "primary key order one batch at a time. Writes to stdout unless --output is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('models', nargs='*', default=['users.Account', 'products.Product'])
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+        parser.add_argument('--batch-size', type=int, default=2000)
+        parser.add_argument('--output', '-o')
+
+    def handle(self, *args, **options):
+        try:
+            model_list = sort_models([apps.get_model(label) for label in options['models']])
+        except (LookupError, ValueError) as exc:
+            raise CommandError(str(exc))
+
+        if options['output']:
+            stream = open(options['output'], 'w', encoding='utf-8')
+        else:
+            self.stdout.ending = None
+            stream = self.stdout
+
+        try:
+            counts = dump_fixture(stream, model_list, options['database'], options['batch_size'])
+        finally:
+            if options['output']:
+                stream.close()
+
+        for label, count in counts.items():
+            self.stderr.write(f'{label}: {count} rows')
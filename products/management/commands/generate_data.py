@@ -0,0 +1,130 @@
+import itertools
+import random
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from products.cache import bump_generations
+from products.models import Product
+from products.search import search_index
+from users.models import Account
+from users.newest import invalidate_newest_accounts
+
+
+ADJECTIVES = [
+    'wireless', 'smart', 'portable', 'compact', 'ergonomic', 'premium', 'classic', 'digital',
+    'organic', 'waterproof', 'foldable', 'rechargeable', 'vintage', 'industrial', 'minimal',
+]
+NOUNS = [
+    'headphones', 'smartband', 'keyboard', 'speaker', 'backpack', 'lamp', 'charger', 'camera',
+    'blender', 'kettle', 'chair', 'notebook', 'monitor', 'router', 'watch', 'mouse', 'jacket',
+]
+BRANDS = ['acme', 'globex', 'initech', 'umbrella', 'hooli', 'stark', 'wayne', 'wonka']
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate synthetic sellers, buyers and products with bulk inserts. The same --seed always "
+        "produces the same rows. Every account gets --password."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sellers', type=int, default=1000)
+        parser.add_argument('--buyers', type=int, default=10000)
+        parser.add_argument('--products', type=int, default=100000)
+        parser.add_argument(
+            '--distribution',
+            choices=['uniform', 'zipf'],
+            default='zipf',
+            help='How products are spread over sellers. zipf gives a few sellers most of the catalog.',
+        )
+        parser.add_argument('--inactive-ratio', type=float, default=0.1)
+        parser.add_argument('--out-of-stock-ratio', type=float, default=0.05)
+        parser.add_argument('--password', default='benchmark-password')
+        parser.add_argument('--prefix', default='synthetic')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def iter_accounts(self, rng, options):
+        # Hashing once keeps generation fast; logins still verify the real hash.
+        password = make_password(options['password'])
+        now = timezone.now()
+        total = options['sellers'] + options['buyers']
+
+        for index in range(total):
+            yield Account(
+                username=f"{options['prefix']}-{index}",
+                password=password,
+                first_name=f'first{index}',
+                last_name=f'last{index}',
+                email=f"{options['prefix']}-{index}@example.com",
+                is_seller=index < options['sellers'],
+                date_joined=now - timedelta(seconds=rng.randrange(365 * 24 * 3600)),
+            )
+
+    def seller_weights(self, count, distribution):
+        if distribution == 'uniform':
+            return None
+
+        return [1 / rank for rank in range(1, count + 1)]
+
+    def iter_products(self, rng, options, sellers):
+        weights = self.seller_weights(len(sellers), options['distribution'])
+        cumulative = list(itertools.accumulate(weights)) if weights else None
+
+        for _ in range(options['products']):
+            if cumulative:
+                seller = rng.choices(sellers, cum_weights=cumulative)[0]
+            else:
+                seller = rng.choice(sellers)
+
+            out_of_stock = rng.random() < options['out_of_stock_ratio']
+
+            yield Product(
+                description=f'{rng.choice(BRANDS)} {rng.choice(ADJECTIVES)} {rng.choice(NOUNS)} {rng.randrange(1000)}',
+                price=Decimal(min(rng.lognormvariate(4, 1), 99999999)).quantize(Decimal('0.01')),
+                quantity=0 if out_of_stock else rng.randrange(1, 500),
+                is_active=rng.random() >= options['inactive_ratio'],
+                seller_id=seller,
+            )
+
+    def bulk_create(self, model, objects, batch_size):
+        created = 0
+        batch = list(itertools.islice(objects, batch_size))
+
+        while batch:
+            model.objects.bulk_create(batch)
+            created += len(batch)
+            batch = list(itertools.islice(objects, batch_size))
+
+        return created
+
+    def handle(self, *args, **options):
+        if options['sellers'] < 1 and options['products']:
+            raise CommandError('Products need at least one seller.')
+
+        rng = random.Random(options['seed'])
+        started = time.perf_counter()
+
+        with transaction.atomic():
+            accounts = self.bulk_create(Account, self.iter_accounts(rng, options), options['batch_size'])
+            sellers = list(
+                Account.objects.filter(username__startswith=f"{options['prefix']}-", is_seller=True)
+                .order_by('username')
+                .values_list('id', flat=True)
+            )
+            products = self.bulk_create(Product, self.iter_products(rng, options, sellers), options['batch_size'])
+
+        # bulk_create skips the post_save signals that would have invalidated these.
+        bump_generations('products')
+        invalidate_newest_accounts()
+        search_index.clear()
+
+        self.stdout.write(
+            f'Created {accounts} accounts and {products} products in {time.perf_counter() - started:.1f}s'
+        )
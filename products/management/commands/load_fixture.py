@@ -0,0 +1,48 @@
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, IntegrityError, transaction
+
+from komercio.fixtures import load_fixture
+from products.cache import bump_bulk_write_generation
+from products.search import search_index
+from users.newest import invalidate_newest_accounts
+
+
+class Command(BaseCommand):
+    help = (
+        "Load a JSON fixture such as komercio.json with batched inserts, streaming it so memory stays flat. "
+        "Rows with an existing primary key are updated. Unlike loaddata, model save() and signals are skipped. "
+        "Use '-' to read from stdin."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('fixture')
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+
+        try:
+            stream = sys.stdin if options['fixture'] == '-' else open(options['fixture'], encoding='utf-8')
+        except OSError as exc:
+            raise CommandError(f'Cannot open fixture: {exc}')
+
+        try:
+            with stream, transaction.atomic(using=options['database']):
+                counts = load_fixture(stream, options['database'], options['batch_size'])
+        except IntegrityError as exc:
+            raise CommandError(f'Fixture conflicts with existing rows, nothing was loaded: {exc}')
+
+        # The skipped post_save signals would have invalidated these, for
+        # every loaded row.
+        bump_bulk_write_generation()
+        invalidate_newest_accounts()
+        search_index.clear()
+
+        for label, count in counts.items():
+            self.stdout.write(f'{label}: {count} rows')
+
+        self.stdout.write(f'Loaded {sum(counts.values())} rows in {time.perf_counter() - started:.1f}s')
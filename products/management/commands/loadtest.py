@@ -0,0 +1,86 @@
+import asyncio
+import statistics
+import time
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand
+
+
+async def fetch(url, timeout):
+    parts = urlsplit(url)
+    target = parts.path + (f'?{parts.query}' if parts.query else '')
+    reader, writer = await asyncio.wait_for(
+        asyncio.open_connection(parts.hostname, parts.port or 80),
+        timeout,
+    )
+
+    try:
+        writer.write(
+            f'GET {target} HTTP/1.1\r\nHost: {parts.netloc}\r\nConnection: close\r\n\r\n'.encode()
+        )
+        await writer.drain()
+        response = await asyncio.wait_for(reader.read(), timeout)
+    finally:
+        writer.close()
+
+    return int(response.split(b' ', 2)[1])
+
+
+async def run_level(url, concurrency, requests, timeout):
+    latencies = []
+    errors = 0
+    queue = asyncio.Queue()
+
+    for _ in range(requests):
+        queue.put_nowait(None)
+
+    async def client():
+        nonlocal errors
+
+        while not queue.empty():
+            queue.get_nowait()
+            started = time.perf_counter()
+
+            try:
+                status = await fetch(url, timeout)
+            except (OSError, asyncio.TimeoutError, IndexError, ValueError):
+                status = None
+
+            if status == 200:
+                latencies.append(time.perf_counter() - started)
+            else:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*[client() for _ in range(concurrency)])
+    elapsed = time.perf_counter() - started
+
+    return latencies, errors, elapsed
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive GET requests at increasing concurrency against running servers, e.g. "
+        "the sync /api/products/ under gunicorn and /api/async/products/ under an ASGI worker."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('urls', nargs='+')
+        parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 10, 50, 100, 200])
+        parser.add_argument('--requests', type=int, default=500)
+        parser.add_argument('--timeout', type=float, default=10.0)
+
+    def handle(self, *args, **options):
+        for url in options['urls']:
+            self.stdout.write(url)
+
+            for concurrency in options['concurrency']:
+                latencies, errors, elapsed = asyncio.run(
+                    run_level(url, concurrency, options['requests'], options['timeout'])
+                )
+                p95 = statistics.quantiles(latencies, n=20)[-1] * 1000 if len(latencies) > 1 else 0
+
+                self.stdout.write(
+                    f'  concurrency {concurrency:>4}: {len(latencies) / elapsed:8.1f} req/s, '
+                    f'p95 {p95:8.1f} ms, errors {errors}'
+                )
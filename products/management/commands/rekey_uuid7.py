@@ -0,0 +1,99 @@
+import time
+
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db import models, transaction
+from django.db.models import Case, Value, When
+from rest_framework.authtoken.models import Token
+
+from komercio.uuids import uuid7
+from products.cache import bump_bulk_write_generation
+from products.models import Product
+from users.authentication import token_cache
+from users.models import Account
+from users.newest import invalidate_newest_accounts
+
+
+# Model and the field whose value becomes the key's timestamp. Products have
+# no creation time, so they keep their current relative order and are dated
+# before every product that already has a time-ordered key.
+REKEY_MODELS = {
+    'accounts': (Account, 'date_joined'),
+    'products': (Product, None),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Rewrite existing uuid4 primary keys as time-ordered uuid7 keys, updating every foreign key "
+        "and many-to-many row that references them. Run it while the application is stopped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('models', nargs='+', choices=sorted(REKEY_MODELS))
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def referencing_fields(self, model):
+        for related_model in apps.get_models(include_auto_created=True):
+            for field in related_model._meta.concrete_fields:
+                if isinstance(field, models.ForeignKey) and field.remote_field.model is model:
+                    yield related_model, field.attname
+
+    def remap(self, queryset, attname, mapping, output_field):
+        whens = [When(**{attname: old}, then=Value(new)) for old, new in mapping.items()]
+        return queryset.filter(**{f'{attname}__in': list(mapping)}).update(
+            **{attname: Case(*whens, output_field=output_field)}
+        )
+
+    def rekey(self, model, timestamp_field, batch_size):
+        pk_field = model._meta.pk
+        references = list(self.referencing_fields(model))
+
+        if timestamp_field:
+            rows = list(model.objects.order_by(timestamp_field, 'pk').values_list('pk', timestamp_field))
+        else:
+            rows = [(pk, None) for pk in model.objects.order_by('pk').values_list('pk', flat=True)]
+
+        # Undated rows go just before the oldest key that is already time-ordered.
+        first_ms = min((pk.int >> 80 for pk, _ in rows if pk.version == 7), default=time.time_ns() // 1_000_000)
+        base_ms = first_ms - len(rows)
+        rekeyed = 0
+
+        # Foreign keys are created deferrable, so referencing rows may point
+        # at the new keys before the referenced rows are updated.
+        with transaction.atomic():
+            for start in range(0, len(rows), batch_size):
+                mapping = {}
+
+                for offset, (pk, timestamp) in enumerate(rows[start:start + batch_size], start):
+                    if pk.version == 7:
+                        continue
+
+                    timestamp_ms = int(timestamp.timestamp() * 1000) if timestamp_field else base_ms + offset
+                    mapping[pk] = uuid7(timestamp_ms)
+
+                if not mapping:
+                    continue
+
+                for related_model, attname in references:
+                    self.remap(related_model._base_manager.all(), attname, mapping, pk_field)
+
+                rekeyed += self.remap(model._base_manager.all(), pk_field.attname, mapping, pk_field)
+
+        return rekeyed, references
+
+    def handle(self, *args, **options):
+        for name in options['models']:
+            model, timestamp_field = REKEY_MODELS[name]
+            rekeyed, references = self.rekey(model, timestamp_field, options['batch_size'])
+            related = ', '.join(f'{related_model._meta.db_table}.{attname}' for related_model, attname in references)
+            self.stdout.write(f'{name}: rekeyed {rekeyed} rows, updated references in {related or "nothing"}')
+
+        # The shared cache outlives the restart: cached responses hold the old
+        # keys, and cached tokens would load accounts with their old pk.
+        bump_bulk_write_generation()
+        invalidate_newest_accounts()
+
+        if 'accounts' in options['models']:
+            for key in Token.objects.values_list('key', flat=True).iterator():
+                token_cache.delete(key)
@@ -0,0 +1,80 @@
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+
+SEARCH_TRIGGER = "product_search_vector_update"
+
+
+def create_search_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    Product = apps.get_model("products", "Product")
+    schema_editor.add_index(
+        Product,
+        django.contrib.postgres.indexes.GinIndex(
+            fields=["search_vector"], name="product_search_vector_idx"
+        ),
+    )
+    schema_editor.execute(
+        f"""
+        CREATE TRIGGER {SEARCH_TRIGGER}
+        BEFORE INSERT OR UPDATE OF description ON products_product
+        FOR EACH ROW EXECUTE FUNCTION
+        tsvector_update_trigger(search_vector, 'pg_catalog.simple', description)
+        """
+    )
+    schema_editor.execute(
+        "UPDATE products_product SET search_vector = to_tsvector('pg_catalog.simple', description)"
+    )
+
+
+def drop_search_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    Product = apps.get_model("products", "Product")
+    schema_editor.execute(f"DROP TRIGGER IF EXISTS {SEARCH_TRIGGER} ON products_product")
+    schema_editor.remove_index(
+        Product,
+        django.contrib.postgres.indexes.GinIndex(
+            fields=["search_vector"], name="product_search_vector_idx"
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0002_alter_product_price_alter_product_quantity"),
+        ("products", "0002_initial"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="product",
+            name="price",
+            field=models.DecimalField(decimal_places=2, max_digits=10),
+        ),
+        migrations.AddField(
+            model_name="product",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunPython(create_search_trigger, drop_search_trigger),
+            ],
+            state_operations=[
+                migrations.AddIndex(
+                    model_name="product",
+                    index=django.contrib.postgres.indexes.GinIndex(
+                        fields=["search_vector"], name="product_search_vector_idx"
+                    ),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 4.1 on 2026-10-18 15:25
+
+from django.db import migrations, models
+import komercio.uuids
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0005_product_version"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="product",
+            name="id",
+            field=models.UUIDField(
+                default=komercio.uuids.generate_primary_key,
+                editable=False,
+                primary_key=True,
+                serialize=False,
+            ),
+        ),
+    ]
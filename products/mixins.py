@@ -1,3 +1,94 @@
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+from komercio.routers import replica_reads, replica_reads_enabled
+
+from .cache import BULK_WRITE_GENERATION, get_cached_response, get_generations, make_etag, set_cached_response
+
+
 class SerializerByMethodMixin:
     def get_serializer_class(self):
-        return self.serializer_map.get(self.request.method, self.serializer_class)
\ No newline at end of file
+        return self.serializer_map.get(self.request.method, self.serializer_class)
+
+
+class PaginationByQueryMixin:
+    pagination_query_param = 'pagination'
+
+    def get_pagination_mode(self):
+        return self.request.query_params.get(self.pagination_query_param)
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            mode = self.get_pagination_mode()
+            pagination_class = self.pagination_map.get(mode, self.pagination_class)
+            self._paginator = pagination_class() if pagination_class else None
+
+        return self._paginator
+
+
+class CachedResponseMixin:
+    def get_cache_key(self, request):
+        query = urlencode(sorted(request.query_params.lists()), doseq=True)
+        return f'{request.get_host()}{request.path}?{query}'
+
+    def get_cache_generations(self):
+        return ['products']
+
+    def get_response_generations(self, data):
+        return []
+
+    def get_etag(self, data):
+        return make_etag(data)
+
+    def is_recent(self, generations):
+        # A replica may not have replayed a write this recent yet.
+        return max(generations.values(), default=0) > time.time() - settings.REPLICA_ROUTING['PIN_SECONDS']
+
+    def get(self, request, *args, **kwargs):
+        key = self.get_cache_key(request)
+        entry = get_cached_response(key)
+
+        if entry is None:
+            generations = get_generations([BULK_WRITE_GENERATION, *self.get_cache_generations()])
+            # A stale replica read cached under the new generation would be
+            # served long after the replica caught up, so rebuild from the
+            # primary while a change may still be replicating.
+            from_replica = replica_reads_enabled() and not self.is_recent(generations)
+
+            with replica_reads(from_replica):
+                response = super().get(request, *args, **kwargs)
+
+            if response.status_code != 200:
+                return response
+
+            response_generations = get_generations(self.get_response_generations(response.data))
+
+            if from_replica and self.is_recent(response_generations):
+                return response
+
+            generations.update(response_generations)
+            entry = set_cached_response(key, response.data, generations, self.get_etag(response.data))
+
+        headers = {
+            'ETag': entry['etag'],
+            'Last-Modified': http_date(entry['last_modified']),
+        }
+        not_modified = get_conditional_response(
+            request,
+            etag=entry['etag'],
+            last_modified=int(entry['last_modified']),
+        )
+
+        if not_modified is not None:
+            for header, value in headers.items():
+                not_modified[header] = value
+
+            return not_modified
+
+        return Response(entry['data'], headers=headers)
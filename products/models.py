@@ -1,12 +1,38 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from users.models import Account
-import uuid 
+from komercio.uuids import generate_primary_key
 
 class Product(models.Model):
-    id = models.UUIDField(default=uuid.uuid4, primary_key=True, editable=False)
+    id = models.UUIDField(default=generate_primary_key, primary_key=True, editable=False)
     description = models.TextField()
     price = models.DecimalField(max_digits=10, decimal_places=2)
     quantity = models.PositiveIntegerField()
     is_active = models.BooleanField(default=True)
+    search_vector = SearchVectorField(null=True, editable=False)
+    version = models.PositiveIntegerField(default=1, editable=False)
 
     seller = models.ForeignKey(Account, on_delete=models.CASCADE, related_name='products')
+
+    def save(self, *args, **kwargs):
+        if self._state.adding:
+            return super().save(*args, **kwargs)
+
+        # Incremented in the database so that concurrent saves never end up
+        # with the same version, and so the same ETag, for different content.
+        self.version = models.F('version') + 1
+
+        if kwargs.get('update_fields') is not None:
+            kwargs['update_fields'] = {*kwargs['update_fields'], 'version'}
+
+        super().save(*args, **kwargs)
+        self.refresh_from_db(fields=['version'])
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=['search_vector'], name='product_search_vector_idx'),
+            models.Index(fields=['price'], condition=models.Q(is_active=True), name='product_active_price_idx'),
+            models.Index(fields=['price'], condition=models.Q(is_active=True, quantity__gt=0), name='product_in_stock_price_idx'),
+            models.Index(fields=['seller', 'is_active', 'price'], name='product_seller_active_idx'),
+        ]
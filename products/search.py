@@ -0,0 +1,142 @@
+import math
+import re
+import threading
+from collections import defaultdict
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connection
+from django.db.models import Case, F, FloatField, Value, When
+
+
+SEARCH_CONFIG = 'simple'
+
+
+def tokenize(text):
+    return re.findall(r'\w+', text.lower())
+
+
+class InvertedIndex:
+    """
+    In-memory search index used where the database has no full-text search.
+
+    The index lives in the process that built it, and only that process's
+    saves update it: other server processes keep serving their own copy
+    until they restart. It is meant for development and tests on SQLite,
+    not for multi-worker deployments, which should run on PostgreSQL.
+    """
+
+    def __init__(self):
+        self._postings = defaultdict(dict)
+        self._documents = {}
+        self._built = False
+        self._lock = threading.RLock()
+
+    def build(self):
+        from .models import Product
+
+        with self._lock:
+            self.clear()
+
+            for pk, description in Product.objects.values_list('id', 'description').iterator():
+                self._add(pk, description)
+
+            self._built = True
+
+    def clear(self):
+        with self._lock:
+            self._postings.clear()
+            self._documents.clear()
+            self._built = False
+
+    def _add(self, pk, description):
+        self._remove(pk)
+
+        tokens = tokenize(description)
+        self._documents[pk] = tokens
+
+        for token in tokens:
+            self._postings[token][pk] = self._postings[token].get(pk, 0) + 1
+
+    def _remove(self, pk):
+        for token in self._documents.pop(pk, []):
+            self._postings[token].pop(pk, None)
+
+            if not self._postings[token]:
+                del self._postings[token]
+
+    def add(self, products):
+        with self._lock:
+            if not self._built:
+                return
+
+            for product in products:
+                self._add(product.pk, product.description)
+
+    def remove(self, products):
+        with self._lock:
+            if not self._built:
+                return
+
+            for product in products:
+                self._remove(product.pk)
+
+    def search(self, text):
+        with self._lock:
+            if not self._built:
+                self.build()
+
+            tokens = set(tokenize(text))
+            postings = [self._postings.get(token, {}) for token in tokens]
+
+            if not postings or not all(postings):
+                return {}
+
+            total = len(self._documents)
+            matches = set.intersection(*(set(posting) for posting in postings))
+
+            return {
+                pk: sum(posting[pk] * math.log(1 + total / len(posting)) for posting in postings)
+                for pk in matches
+            }
+
+
+search_index = InvertedIndex()
+
+
+def uses_search_vector():
+    return connection.vendor == 'postgresql'
+
+
+def index_products(products):
+    if not uses_search_vector():
+        search_index.add(products)
+
+
+def unindex_products(products):
+    if not uses_search_vector():
+        search_index.remove(products)
+
+
+def search_products(queryset, text):
+    if uses_search_vector():
+        query = SearchQuery(text, config=SEARCH_CONFIG)
+
+        return (
+            queryset.filter(search_vector=query)
+            .annotate(search_rank=SearchRank(F('search_vector'), query))
+            .order_by('-search_rank', 'id')
+        )
+
+    ranks = search_index.search(text)
+
+    if not ranks:
+        return queryset.none()
+
+    return (
+        queryset.filter(id__in=ranks)
+        .annotate(search_rank=Case(
+            *[When(id=pk, then=Value(rank)) for pk, rank in ranks.items()],
+            output_field=FloatField(),
+        ))
+        .order_by('-search_rank', 'id')
+    )
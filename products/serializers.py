@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from rest_framework.exceptions import APIException
 
 from .models import Product
 from users.serializers import AccountSerializer
@@ -11,10 +12,38 @@ class ProductSerializerDetailed(serializers.ModelSerializer):
         model = Product
         fields = ['id','seller', 'description', 'price', 'quantity', 'is_active']
 
+    def update(self, instance, validated_data):
+        for field, value in validated_data.items():
+            setattr(instance, field, value)
+
+        # Writing only the submitted fields keeps a reservation's concurrent
+        # quantity decrement, and reloading the others shows it in the response.
+        instance.save(update_fields=validated_data.keys())
+        unwritten = [name for name, field in self.fields.items() if not field.read_only and name not in validated_data]
+
+        if unwritten:
+            instance.refresh_from_db(fields=unwritten)
+
+        return instance
+
 
 class ProductSerializerGeneral(serializers.ModelSerializer):
     class Meta:
         model = Product
         fields = ['description', 'price', 'quantity', 'is_active', 'seller_id']
         read_only_fields = ['description', 'price', 'quantity', 'is_active', 'seller_id']
-        
\ No newline at end of file
+
+
+class InsufficientStockError(APIException):
+    status_code = 409
+    default_detail = 'Not enough stock to reserve.'
+
+
+class PreconditionFailedError(APIException):
+    status_code = 412
+    default_detail = 'Product was modified since it was fetched.'
+
+
+class ReservationSerializer(serializers.Serializer):
+    id = serializers.UUIDField()
+    quantity = serializers.IntegerField(min_value=1)
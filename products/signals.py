@@ -0,0 +1,39 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from users.models import Account
+
+from .cache import account_generation, bump_generations, product_generation
+from .models import Product
+from .search import index_products, unindex_products
+
+
+def bump_generations_on_commit(using, *names):
+    # A response rebuilt before the commit would read the old row and be
+    # cached under the new generation.
+    transaction.on_commit(partial(bump_generations, *names), using=using)
+
+
+@receiver(post_save, sender=Product)
+def index_saved_product(sender, instance, **kwargs):
+    index_products([instance])
+
+
+@receiver(post_delete, sender=Product)
+def unindex_deleted_product(sender, instance, **kwargs):
+    unindex_products([instance])
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+def invalidate_product_responses(sender, instance, using, **kwargs):
+    bump_generations_on_commit(using, 'products', product_generation(instance.pk))
+
+
+@receiver(post_save, sender=Account)
+@receiver(post_delete, sender=Account)
+def invalidate_seller_responses(sender, instance, using, **kwargs):
+    bump_generations_on_commit(using, account_generation(instance.pk))
@@ -1,9 +1,24 @@
 from rest_framework.test import APITestCase
 from products.models import Product
+from products.serializers import ProductSerializerDetailed
+from products.search import search_index
+from products.cache import account_generation, get_generations, product_generation
 from users.models import Account
+from komercio.tests.base import SellerProductTestCase, SellerTestCase
+from users.authentication import CachedTokenAuthentication
 from rest_framework.views import status
 from rest_framework.authtoken.models import Token
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db.models import Count
 from django.urls import reverse
+import io
+import tempfile
+import time
+import json
+from pathlib import Path
+from unittest import mock
 
 
 class TestProductView(APITestCase):
@@ -58,6 +73,9 @@ class TestProductView(APITestCase):
         cls.base_url = reverse("product-view")
         cls.detail_url = reverse("product-detail", kwargs={"pk": seller_account.id})
 
+    def setUp(self) -> None:
+        cache.clear()
+
     
     def test_seller_can_create_product(self):
         print("test seller can create a product")
@@ -255,6 +273,784 @@ class TestProductDetailView(APITestCase):
         excepted_response = status.HTTP_403_FORBIDDEN
 
         self.assertEqual(response.status_code, excepted_response)
-    
 
-  
+
+class TestProductCursorPagination(SellerTestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        super().setUpTestData()
+
+        cls.products = [
+            Product.objects.create(description=f"product {index}", price="10.00", quantity=1, seller=cls.seller)
+            for index in range(5)
+        ]
+
+        cls.base_url = reverse("product-view")
+
+
+    def test_cursor_pagination_walks_every_product(self):
+        print("test cursor pagination walks every product")
+
+        response = self.client.get(self.base_url, {"pagination": "cursor", "page_size": 2})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("count", response.data.keys())
+        self.assertEqual(len(response.data["results"]), 2)
+
+        descriptions = [product["description"] for product in response.data["results"]]
+
+        while response.data["next"]:
+            response = self.client.get(response.data["next"])
+            descriptions += [product["description"] for product in response.data["results"]]
+
+        expected_descriptions = [product.description for product in sorted(self.products, key=lambda product: str(product.id))]
+
+        self.assertEqual(descriptions, expected_descriptions)
+
+
+    def test_ordering_ignores_cursor_pagination(self):
+        print("test a requested ordering is kept with cursor pagination")
+
+        Product.objects.filter(id=self.products[2].id).update(price="5.00")
+        response = self.client.get(self.base_url, {"ordering": "price", "pagination": "cursor"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], len(self.products))
+        self.assertEqual(response.data["results"][0]["description"], self.products[2].description)
+
+
+    def test_page_number_pagination_is_default(self):
+        print("test page number pagination is the default")
+
+        response = self.client.get(self.base_url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], len(self.products))
+
+
+class TestProductQueryCount(SellerTestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        super().setUpTestData()
+
+        sellers = [cls.seller] + [
+            Account.objects.create_user(**{**cls.account_data, "username": f"cloud {index}"})
+            for index in range(1, 3)
+        ]
+        cls.products = [
+            Product.objects.create(description=f"product {index}", price="10.00", quantity=1, seller=sellers[index % 3])
+            for index in range(10)
+        ]
+
+        cls.base_url = reverse("product-view")
+        cls.detail_url = reverse("product-detail", kwargs={"pk": cls.products[0].id})
+
+
+    def test_list_query_count_does_not_grow_with_page_size(self):
+        print("test list query count does not grow with page size")
+
+        for page_size in (1, 5, 10):
+            with self.assertNumQueries(1):
+                response = self.client.get(self.base_url, {"pagination": "cursor", "page_size": page_size})
+
+            self.assertEqual(len(response.data["results"]), page_size)
+
+
+    def test_detail_fetches_seller_in_the_same_query(self):
+        print("test detail fetches seller in the same query")
+
+        with self.assertNumQueries(1):
+            response = self.client.get(self.detail_url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["seller"]["id"], str(self.products[0].seller_id))
+
+
+class TestProductBulkView(SellerTestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        super().setUpTestData()
+
+        cls.account_data_2 = {
+            "username": "krun",
+            "password": "1234",
+            "first_name": "krun",
+            "last_name": "demno",
+            "is_seller": False
+        }
+
+        cls.products_data = [
+            {"description": f"product {index}", "price": "10.99", "quantity": index}
+            for index in range(5)
+        ]
+
+        regular_account = Account.objects.create_user(**cls.account_data_2)
+        cls.seller_token = Token.objects.create(user=cls.seller)
+        cls.regular_token = Token.objects.create(user=regular_account)
+
+        cls.bulk_url = reverse("product-bulk")
+
+
+    def test_seller_can_bulk_create_products_from_json(self):
+        print("test seller can bulk create products from a json array")
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + self.seller_token.key)
+
+        response = self.client.post(self.bulk_url, self.products_data, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["created"], len(self.products_data))
+        self.assertEqual(self.seller.products.count(), len(self.products_data))
+
+
+    def test_seller_can_bulk_create_products_from_ndjson(self):
+        print("test seller can bulk create products from ndjson")
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + self.seller_token.key)
+
+        body = "\n".join(json.dumps(product) for product in self.products_data)
+        response = self.client.post(self.bulk_url, body, content_type="application/x-ndjson")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.seller.products.count(), len(self.products_data))
+
+
+    def test_bulk_create_reports_row_errors_and_creates_nothing(self):
+        print("test bulk create reports row errors and creates nothing")
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + self.seller_token.key)
+
+        products_data = [*self.products_data, {"description": "no price", "quantity": 1}]
+        response = self.client.post(self.bulk_url, products_data, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(len(response.data["errors"]), 1)
+        self.assertEqual(response.data["errors"][0]["row"], len(self.products_data))
+        self.assertIn("price", response.data["errors"][0]["errors"])
+        self.assertEqual(Product.objects.count(), 0)
+
+
+    def test_non_seller_can_not_bulk_create_products(self):
+        print("test non seller can not bulk create products")
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + self.regular_token.key)
+
+        response = self.client.post(self.bulk_url, self.products_data, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class TestProductExportView(SellerTestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        super().setUpTestData()
+
+        other_seller = Account.objects.create_user(**{**cls.account_data, "username": "odin"})
+
+        cls.products = [
+            Product.objects.create(description=f"product {index}", price="10.99", quantity=index, seller=cls.seller)
+            for index in range(3)
+        ]
+        Product.objects.create(description="inactive", price="1.00", quantity=0, is_active=False, seller=cls.seller)
+        Product.objects.create(description="other seller", price="1.00", quantity=0, seller=other_seller)
+
+        feed_account = Account.objects.create_superuser(
+            username="feed", password="1234", first_name="feed", last_name="feed", is_seller=False
+        )
+        cls.feed_token = Token.objects.create(user=feed_account)
+        cls.seller_token = Token.objects.create(user=cls.seller)
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + self.feed_token.key)
+
+
+    def test_export_requires_staff_account(self):
+        print("test export is only open to staff accounts")
+
+        url = reverse("product-export", kwargs={"export_format": "csv"})
+        self.client.credentials()
+        anonymous_response = self.client.get(url)
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + self.seller_token.key)
+        seller_response = self.client.get(url)
+
+        self.assertEqual(anonymous_response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(seller_response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+    def test_export_ndjson_filtered_by_seller_and_is_active(self):
+        print("test export ndjson filtered by seller and is_active")
+
+        url = reverse("product-export", kwargs={"export_format": "ndjson"})
+        response = self.client.get(url, {"seller": self.seller.id, "is_active": "true"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+
+        rows = [json.loads(line) for line in b"".join(response.streaming_content).decode().splitlines()]
+
+        self.assertEqual(len(rows), len(self.products))
+        self.assertEqual({row["id"] for row in rows}, {str(product.id) for product in self.products})
+        self.assertEqual(rows[0]["price"], "10.99")
+
+
+    def test_export_csv_streams_every_product(self):
+        print("test export csv streams every product")
+
+        url = reverse("product-export", kwargs={"export_format": "csv"})
+        response = self.client.get(url)
+
+        lines = b"".join(response.streaming_content).decode().splitlines()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(lines[0], "id,seller_id,description,price,quantity,is_active")
+        self.assertEqual(len(lines), Product.objects.count() + 1)
+
+
+    def test_export_unknown_format(self):
+        print("test export with an unknown format")
+
+        url = reverse("product-export", kwargs={"export_format": "xml"})
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class TestProductSearch(SellerTestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        super().setUpTestData()
+
+        cls.seller_token = Token.objects.create(user=cls.seller)
+
+        cls.smartband = Product.objects.create(description="Smartband XYZ", price="10.00", quantity=1, seller=cls.seller)
+        cls.smartband_strap = Product.objects.create(description="Strap for smartband, fits any smartband", price="2.00", quantity=1, seller=cls.seller)
+        Product.objects.create(description="google home", price="10.00", quantity=1, seller=cls.seller)
+
+        cls.base_url = reverse("product-view")
+
+    def setUp(self) -> None:
+        super().setUp()
+        search_index.clear()
+
+
+    def test_search_ranks_matching_products(self):
+        print("test search ranks matching products")
+
+        response = self.client.get(self.base_url, {"search": "Smartband"})
+        descriptions = [product["description"] for product in response.data["results"]]
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 2)
+        self.assertEqual(descriptions, [self.smartband_strap.description, self.smartband.description])
+
+
+    def test_search_ignores_cursor_pagination(self):
+        print("test search keeps its rank order with cursor pagination")
+
+        response = self.client.get(self.base_url, {"search": "Smartband", "pagination": "cursor"})
+        descriptions = [product["description"] for product in response.data["results"]]
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 2)
+        self.assertEqual(descriptions, [self.smartband_strap.description, self.smartband.description])
+
+
+    def test_search_requires_every_term(self):
+        print("test search requires every term")
+
+        response = self.client.get(self.base_url, {"search": "smartband home"})
+
+        self.assertEqual(response.data["count"], 0)
+
+
+    def test_search_index_follows_product_updates(self):
+        print("test search index follows product updates")
+
+        self.client.get(self.base_url, {"search": "smartband"})
+
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + self.seller_token.key)
+        self.client.patch(reverse("product-detail", kwargs={"pk": self.smartband.id}), {"description": "Smartwatch XYZ"})
+        self.client.post(reverse("product-bulk"), [{"description": "smartwatch strap", "price": "1.00", "quantity": 1}], format="json")
+
+        response = self.client.get(self.base_url, {"search": "smartwatch"})
+
+        self.assertEqual(response.data["count"], 2)
+
+
+class TestProductFilters(SellerTestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        super().setUpTestData()
+
+        other_seller = Account.objects.create_user(**{**cls.account_data, "username": "odin"})
+
+        Product.objects.create(description="cheap", price="5.00", quantity=3, seller=cls.seller)
+        Product.objects.create(description="sold out", price="15.00", quantity=0, seller=cls.seller)
+        Product.objects.create(description="expensive", price="50.00", quantity=1, seller=cls.seller)
+        Product.objects.create(description="inactive", price="20.00", quantity=1, is_active=False, seller=cls.seller)
+        Product.objects.create(description="other seller", price="25.00", quantity=1, seller=other_seller)
+
+        cls.base_url = reverse("product-view")
+
+
+    def list_descriptions(self, params):
+        response = self.client.get(self.base_url, {**params, "pagination": "cursor", "page_size": 10})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        return {product["description"] for product in response.data["results"]}
+
+
+    def test_filter_by_price_range_stock_and_activity(self):
+        print("test filter by price range, stock and activity")
+
+        descriptions = self.list_descriptions({
+            "min_price": "10",
+            "max_price": "30",
+            "in_stock": "true",
+            "is_active": "true",
+        })
+
+        self.assertEqual(descriptions, {"other seller"})
+
+
+    def test_filter_by_seller(self):
+        print("test filter by seller")
+
+        descriptions = self.list_descriptions({"seller": self.seller.id, "is_active": "false"})
+
+        self.assertEqual(descriptions, {"inactive"})
+
+
+    def test_ordering_by_price(self):
+        print("test ordering by price")
+
+        response = self.client.get(self.base_url, {"ordering": "-price", "is_active": "true"})
+        prices = [product["price"] for product in response.data["results"]]
+
+        self.assertEqual(prices, ["50.00", "25.00"])
+
+
+    def test_invalid_filter_values(self):
+        print("test invalid filter values")
+
+        response = self.client.get(self.base_url, {"min_price": "cheap", "seller": "nobody"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class TestProductReserveView(SellerProductTestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        super().setUpTestData()
+
+        buyer_account = Account.objects.create_user(
+            username="krun", password="1234", first_name="krun", last_name="demno", is_seller=False
+        )
+        cls.buyer_token = Token.objects.create(user=buyer_account)
+
+        cls.smartband = cls.product
+        cls.google_home = Product.objects.create(description="google home", price="10.00", quantity=1, seller=cls.seller)
+
+        cls.reserve_url = reverse("product-reserve")
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + self.buyer_token.key)
+
+
+    def test_reserve_decrements_stock(self):
+        print("test reserve decrements stock")
+
+        response = self.client.post(self.reserve_url, {"id": str(self.smartband.id), "quantity": 2}, format="json")
+
+        self.smartband.refresh_from_db()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.smartband.quantity, 3)
+
+
+    def test_reserve_multiple_products_in_one_request(self):
+        print("test reserve multiple products in one request")
+
+        items = [
+            {"id": str(self.smartband.id), "quantity": 2},
+            {"id": str(self.google_home.id), "quantity": 1},
+            {"id": str(self.smartband.id), "quantity": 3},
+        ]
+        response = self.client.post(self.reserve_url, items, format="json")
+
+        self.smartband.refresh_from_db()
+        self.google_home.refresh_from_db()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.smartband.quantity, 0)
+        self.assertEqual(self.google_home.quantity, 0)
+
+
+    def test_reserve_more_than_stock_rolls_back(self):
+        print("test reserve more than stock rolls back every item")
+
+        items = [
+            {"id": str(self.smartband.id), "quantity": 2},
+            {"id": str(self.google_home.id), "quantity": 2},
+        ]
+        response = self.client.post(self.reserve_url, items, format="json")
+
+        self.smartband.refresh_from_db()
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.data["id"], str(self.google_home.id))
+        self.assertEqual(self.smartband.quantity, 5)
+
+
+    def test_anonymous_can_not_reserve(self):
+        print("test anonymous user can not reserve")
+
+        self.client.credentials()
+        response = self.client.post(self.reserve_url, {"id": str(self.smartband.id), "quantity": 1}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class TestProductResponseCache(SellerProductTestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        super().setUpTestData()
+
+        cls.seller_token = Token.objects.create(user=cls.seller)
+
+        cls.base_url = reverse("product-view")
+        cls.detail_url = reverse("product-detail", kwargs={"pk": cls.product.id})
+
+
+    def test_list_is_served_from_cache(self):
+        print("test product list is served from the cache")
+
+        first_response = self.client.get(self.base_url, {"is_active": "true"})
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.base_url, {"is_active": "true"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, first_response.data)
+        self.assertEqual(response["ETag"], first_response["ETag"])
+
+
+    def test_conditional_requests_return_not_modified(self):
+        print("test conditional requests return not modified")
+
+        response = self.client.get(self.detail_url)
+
+        etag_response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=response["ETag"])
+        date_response = self.client.get(self.detail_url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"])
+
+        self.assertEqual(etag_response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(date_response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+
+    def test_product_change_invalidates_cached_responses(self):
+        print("test product change invalidates cached responses")
+
+        list_response = self.client.get(self.base_url)
+        detail_response = self.client.get(self.detail_url)
+
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + self.seller_token.key)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(self.detail_url, {"description": "updated"})
+
+        response = self.client.get(self.base_url, HTTP_IF_NONE_MATCH=list_response["ETag"])
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"][0]["description"], "updated")
+
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=detail_response["ETag"])
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["description"], "updated")
+
+
+    def test_generations_are_bumped_on_commit(self):
+        print("test product changes bump cache generations once they commit")
+
+        names = ["products", product_generation(self.product.id), account_generation(self.seller.id)]
+
+        with mock.patch("products.cache.time.time", return_value=time.time() - 3600):
+            before = get_generations(names)
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.product.save()
+            self.seller.save()
+
+            # Until the commit, a response rebuilt by another request would
+            # read the old rows and must not be cached as current.
+            self.assertEqual(get_generations(names), before)
+
+        for callback in callbacks:
+            callback()
+
+        self.assertTrue(all(after > before[name] for name, after in get_generations(names).items()))
+
+
+    def test_seller_change_invalidates_cached_detail(self):
+        print("test seller change invalidates cached product detail")
+
+        self.client.get(self.detail_url)
+
+        self.seller.first_name = "updated"
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.seller.save()
+
+        response = self.client.get(self.detail_url)
+
+        self.assertEqual(response.data["seller"]["first_name"], "updated")
+
+
+    def test_reservation_invalidates_cached_detail(self):
+        print("test reservation invalidates cached product detail")
+
+        self.client.get(self.detail_url)
+
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + self.seller_token.key)
+        self.client.post(reverse("product-reserve"), {"id": str(self.product.id), "quantity": 2}, format="json")
+
+        response = self.client.get(self.detail_url)
+
+        self.assertEqual(response.data["quantity"], 3)
+
+
+    def test_alternate_id_spelling_is_invalidated(self):
+        print("test any spelling of a product id is invalidated by writes")
+
+        alternate_url = reverse("product-detail", kwargs={"pk": self.product.id.hex.upper()})
+        self.client.get(alternate_url)
+
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + self.seller_token.key)
+        self.client.patch(self.detail_url, {"description": "updated"})
+        self.client.post(reverse("product-reserve"), {"id": str(self.product.id), "quantity": 2}, format="json")
+
+        response = self.client.get(alternate_url)
+        invalid_response = self.client.get(reverse("product-detail", kwargs={"pk": "not-a-uuid"}))
+
+        self.assertEqual(response.data["description"], "updated")
+        self.assertEqual(response.data["quantity"], 3)
+        self.assertEqual(invalid_response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class TestProductConditionalRequests(SellerProductTestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        super().setUpTestData()
+
+        cls.seller_token = Token.objects.create(user=cls.seller)
+
+        cls.detail_url = reverse("product-detail", kwargs={"pk": cls.product.id})
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + self.seller_token.key)
+
+
+    def test_product_version_increases_on_save(self):
+        print("test product version increases on save")
+
+        self.product.description = "updated"
+        self.product.save()
+        self.product.refresh_from_db()
+
+        self.assertEqual(self.product.version, 2)
+
+
+    def test_if_none_match_skips_serialization(self):
+        print("test if none match answers not modified from the product version")
+
+        etag = self.client.get(self.detail_url)["ETag"]
+        cache.clear()
+        CachedTokenAuthentication().authenticate_credentials(self.seller_token.key)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+
+
+    def test_patch_with_current_if_match(self):
+        print("test patch with the current if match")
+
+        etag = self.client.get(self.detail_url)["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(self.detail_url, {"description": "updated"}, HTTP_IF_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(self.client.get(self.detail_url)["ETag"], response["ETag"])
+
+
+    def test_patch_with_stale_if_match(self):
+        print("test patch with a stale if match")
+
+        etag = self.client.get(self.detail_url)["ETag"]
+        self.client.patch(self.detail_url, {"quantity": 4})
+
+        response = self.client.patch(self.detail_url, {"description": "updated"}, HTTP_IF_MATCH=etag)
+        self.product.refresh_from_db()
+
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        self.assertEqual(self.product.description, "Smartband XYZ")
+
+
+    def test_concurrent_saves_get_distinct_versions(self):
+        print("test concurrent saves of the same product get distinct versions")
+
+        first = Product.objects.get(pk=self.product.pk)
+        second = Product.objects.get(pk=self.product.pk)
+
+        first.description = "first"
+        first.save()
+        second.description = "second"
+        second.save()
+
+        self.assertEqual(first.version, 2)
+        self.assertEqual(second.version, 3)
+
+
+    def test_update_keeps_concurrent_reservation(self):
+        print("test an update does not overwrite a concurrent reservation")
+
+        stale = Product.objects.select_related("seller").get(pk=self.product.pk)
+        self.client.post(reverse("product-reserve"), {"id": str(self.product.id), "quantity": 2}, format="json")
+
+        serializer = ProductSerializerDetailed(stale, data={"description": "updated"}, partial=True)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        self.product.refresh_from_db()
+
+        self.assertEqual(self.product.quantity, 3)
+        self.assertEqual(self.product.description, "updated")
+        self.assertEqual(serializer.data["quantity"], 3)
+        self.assertEqual(serializer.data["seller"]["username"], "cloud")
+
+
+class TestAsyncProductViews(SellerTestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        super().setUpTestData()
+
+        cls.products = [
+            Product.objects.create(description=f"product {index}", price="10.00", quantity=index, seller=cls.seller)
+            for index in range(3)
+        ]
+
+
+    async def test_async_list_matches_sync_list(self):
+        print("test async product list matches the sync list")
+
+        for page in ("1", "2"):
+            response = await self.async_client.get(reverse("async-product-view"), {"page": page})
+            sync_response = await sync_to_async(self.client.get)(reverse("product-view"), {"page": page})
+
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(
+                json.loads(response.content)["results"],
+                json.loads(sync_response.content)["results"],
+            )
+
+
+    async def test_async_list_invalid_page(self):
+        print("test async product list with an invalid page")
+
+        response = await self.async_client.get(reverse("async-product-view"), {"page": "9"})
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+    async def test_async_detail(self):
+        print("test async product detail")
+
+        url = reverse("async-product-detail", kwargs={"pk": self.products[0].id})
+        response = await self.async_client.get(url)
+        missing_response = await self.async_client.get(reverse("async-product-detail", kwargs={"pk": "missing"}))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(json.loads(response.content)["seller"]["username"], "cloud")
+        self.assertEqual(missing_response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class TestBenchmarkCommands(APITestCase):
+    def generate(self, prefix):
+        call_command(
+            "generate_data", sellers=3, buyers=5, products=60, prefix=prefix, seed=7, stdout=io.StringIO()
+        )
+        return Product.objects.filter(seller__username__startswith=f"{prefix}-")
+
+
+    def test_generate_data(self):
+        print("test generate_data creates skewed, reproducible data")
+
+        products = self.generate("first")
+        per_seller = list(
+            products.values("seller__username").annotate(total=Count("id")).order_by("-total").values_list("seller__username", flat=True)
+        )
+
+        self.assertEqual(Account.objects.filter(username__startswith="first-").count(), 8)
+        self.assertEqual(Account.objects.filter(username__startswith="first-", is_seller=True).count(), 3)
+        self.assertEqual(products.count(), 60)
+        self.assertEqual(per_seller[0], "first-0")
+        self.assertTrue(self.client.login(username="first-4", password="benchmark-password"))
+
+        second = self.generate("second")
+        self.assertEqual(
+            list(products.order_by("id").values_list("description", "price", "quantity")),
+            list(second.order_by("id").values_list("description", "price", "quantity")),
+        )
+
+
+    def test_benchmark_endpoints(self):
+        print("test benchmark_endpoints reports every scenario and rolls back")
+
+        self.generate("bench")
+        accounts = Account.objects.count()
+
+        with tempfile.TemporaryDirectory() as directory:
+            results_path = Path(directory) / "results.json"
+            call_command("benchmark_endpoints", requests=3, warmup=0, json_output=str(results_path), stdout=io.StringIO())
+            results = json.loads(results_path.read_text())
+
+            call_command(
+                "benchmark_endpoints",
+                requests=3,
+                warmup=0,
+                scenarios=["product-detail"],
+                compare=str(results_path),
+                tolerance=100,
+                stdout=io.StringIO(),
+            )
+
+        self.assertEqual(set(results), {"product-list", "product-detail", "product-create", "login", "account-update"})
+        self.assertEqual(set(results["login"]), {"p50_ms", "p95_ms", "p99_ms", "requests_per_second", "queries_per_request"})
+        self.assertEqual(Account.objects.count(), accounts)
+        self.assertEqual(Product.objects.count(), 60)
+
+
+    def test_benchmark_endpoints_cold_cache(self):
+        print("test benchmark_endpoints cold cache runs also authenticate every request")
+
+        self.generate("bench")
+
+        with tempfile.TemporaryDirectory() as directory:
+            results_path = Path(directory) / "results.json"
+            call_command(
+                "benchmark_endpoints",
+                requests=3,
+                warmup=0,
+                scenarios=["product-detail"],
+                cold_cache=True,
+                json_output=str(results_path),
+                stdout=io.StringIO(),
+            )
+            results = json.loads(results_path.read_text())
+
+        with self.assertRaisesMessage(CommandError, "--requests must be at least 2"):
+            call_command("benchmark_endpoints", requests=1, stdout=io.StringIO())
+
+        self.assertEqual(results["product-detail"]["queries_per_request"], 2)
@@ -1,7 +1,12 @@
 from django.urls import path
-from . import views
+from . import async_views, views
 
 urlpatterns = [
     path('products/', views.ProductView.as_view(), name="product-view"),
+    path('products/bulk/', views.ProductBulkView.as_view(), name="product-bulk"),
+    path('products/export/<str:export_format>/', views.ProductExportView.as_view(), name="product-export"),
+    path('products/reserve/', views.ProductReserveView.as_view(), name="product-reserve"),
     path('products/<pk>/', views.ProductDetailView.as_view(), name="product-detail"),
+    path('async/products/', async_views.AsyncProductView.as_view(), name="async-product-view"),
+    path('async/products/<pk>/', async_views.AsyncProductDetailView.as_view(), name="async-product-detail"),
 ]
\ No newline at end of file
@@ -1,35 +1,224 @@
+import uuid
+
+from django.db import transaction
+from django.db.models import F
+from django.utils.cache import get_conditional_response
+from django.http import Http404, StreamingHttpResponse
 from rest_framework import generics
-from rest_framework.authentication import TokenAuthentication
+from rest_framework.filters import OrderingFilter
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.views import status
+
+from komercio.fast_serializers import FastListMixin
+from komercio.parsers import FastJSONParser
+from users.authentication import CachedTokenAuthentication
 
 from .models import Product
-from .serializers import ProductSerializerDetailed, ProductSerializerGeneral
+from .serializers import (
+    InsufficientStockError,
+    PreconditionFailedError,
+    ProductSerializerDetailed,
+    ProductSerializerGeneral,
+    ReservationSerializer,
+)
 from .permissions import IsProductOwner, IsSellerAndAuthenticated
-from .mixins import SerializerByMethodMixin
+from .mixins import CachedResponseMixin, SerializerByMethodMixin, PaginationByQueryMixin
+from .pagination import ProductCursorPagination
+from .parsers import NDJSONParser
+from .exports import EXPORT_FIELDS, EXPORT_FORMATS
+from .search import index_products, search_products
+from .filters import ProductFilterBackend
+from .cache import account_generation, bump_generations, product_etag, product_generation
 
 
-class ProductView(SerializerByMethodMixin, generics.ListCreateAPIView):
-    authentication_classes = [TokenAuthentication]
+class ProductView(SerializerByMethodMixin, PaginationByQueryMixin, CachedResponseMixin, FastListMixin, generics.ListCreateAPIView):
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsSellerAndAuthenticated]
 
-    queryset = Product.objects.all()
+    queryset = Product.objects.select_related('seller')
     serializer_map = {
         'GET': ProductSerializerGeneral,
         'POST': ProductSerializerDetailed,
     }
+    pagination_map = {
+        'cursor': ProductCursorPagination,
+    }
+    filter_backends = [ProductFilterBackend, OrderingFilter]
+    ordering_fields = ['price', 'quantity']
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        search = self.request.query_params.get('search')
+
+        if search:
+            queryset = search_products(queryset, search)
+
+        return queryset
+
+    def get_pagination_mode(self):
+        # Cursor pages are keyed on the id and would lose the search rank or
+        # requested order, so those lists always get numbered pages.
+        if self.request.query_params.get('search') or self.request.query_params.get(api_settings.ORDERING_PARAM):
+            return None
+
+        return super().get_pagination_mode()
     
     def perform_create(self, serializer):
         seller = self.request.user
         serializer.save(seller=seller)
 
 
-class ProductDetailView(generics.RetrieveUpdateAPIView):
-    authentication_classes = [TokenAuthentication]
+class ProductDetailView(CachedResponseMixin, generics.RetrieveUpdateAPIView):
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsProductOwner]
     
-    queryset = Product.objects.all()
+    queryset = Product.objects.select_related('seller')
     serializer_class = ProductSerializerDetailed
 
+    def get_cache_generations(self):
+        # Any spelling of the id in the URL must share the generation that
+        # saves and reservations bump.
+        try:
+            pk = uuid.UUID(self.kwargs['pk'])
+        except ValueError:
+            raise Http404
+
+        return [product_generation(pk)]
+
+    def get_response_generations(self, data):
+        return [account_generation(data['seller']['id'])]
+
+    def get_etag(self, data):
+        return self.etag
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        self.etag = product_etag(instance)
+
+        not_modified = get_conditional_response(request, etag=self.etag)
+
+        if not_modified is not None:
+            not_modified['ETag'] = self.etag
+            return not_modified
+
+        serializer = self.get_serializer(instance)
+        return Response(serializer.data)
+
+    def update(self, request, *args, **kwargs):
+        with transaction.atomic():
+            if 'If-Match' in request.headers:
+                self.queryset = self.queryset.select_for_update(of=('self',))
+
+            response = super().update(request, *args, **kwargs)
+
+        response['ETag'] = self.etag
+        return response
+
+    def perform_update(self, serializer):
+        if get_conditional_response(self.request, etag=product_etag(serializer.instance)) is not None:
+            raise PreconditionFailedError
+
+        self.etag = product_etag(serializer.save())
+
+
+class ProductBulkView(generics.GenericAPIView):
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsSellerAndAuthenticated]
+    parser_classes = [FastJSONParser, NDJSONParser]
+
+    serializer_class = ProductSerializerDetailed
+    batch_size = 1000
+
+    def post(self, request, *args, **kwargs):
+        if not isinstance(request.data, list):
+            return Response(
+                {"detail": "Expected a list of products."},
+                status.HTTP_400_BAD_REQUEST,
+            )
+
+        products = []
+        errors = []
+
+        for offset in range(0, len(request.data), self.batch_size):
+            serializer = self.get_serializer(data=request.data[offset:offset + self.batch_size], many=True)
+
+            if not serializer.is_valid():
+                errors += [
+                    {"row": offset + index, "errors": row_errors}
+                    for index, row_errors in enumerate(serializer.errors)
+                    if row_errors
+                ]
+                continue
+
+            products += [Product(**row, seller=request.user) for row in serializer.validated_data]
+
+        if errors:
+            return Response({"errors": errors}, status.HTTP_400_BAD_REQUEST)
+
+        with transaction.atomic():
+            Product.objects.bulk_create(products, batch_size=self.batch_size)
+
+        index_products(products)
+        bump_generations('products')
+
+        return Response({"created": len(products)}, status.HTTP_201_CREATED)
+
+
+class ProductExportView(generics.GenericAPIView):
+    authentication_classes = [CachedTokenAuthentication]
+    # The full catalog, inactive products included, is for internal feeds
+    # that authenticate as a staff account.
+    permission_classes = [IsAdminUser]
+
+    queryset = Product.objects.all()
+    filter_backends = [ProductFilterBackend]
+    chunk_size = 2000
+
+    def get(self, request, export_format, *args, **kwargs):
+        if export_format not in EXPORT_FORMATS:
+            raise Http404
+
+        stream, content_type = EXPORT_FORMATS[export_format]
+        rows = self.filter_queryset(self.get_queryset()).order_by().values(*EXPORT_FIELDS).iterator(chunk_size=self.chunk_size)
+
+        response = StreamingHttpResponse(stream(rows), content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="products.{export_format}"'
+
+        return response
+
+
+class ProductReserveView(generics.GenericAPIView):
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    serializer_class = ReservationSerializer
+
+    def post(self, request, *args, **kwargs):
+        many = isinstance(request.data, list)
+        serializer = self.get_serializer(data=request.data, many=many)
+        serializer.is_valid(raise_exception=True)
+
+        items = serializer.validated_data if many else [serializer.validated_data]
+        quantities = {}
+
+        for item in items:
+            quantities[item['id']] = quantities.get(item['id'], 0) + item['quantity']
+
+        with transaction.atomic():
+            for pk in sorted(quantities):
+                reserved = Product.objects.filter(
+                    pk=pk,
+                    is_active=True,
+                    quantity__gte=quantities[pk],
+                ).update(quantity=F('quantity') - quantities[pk], version=F('version') + 1)
 
+                if not reserved:
+                    raise InsufficientStockError({"id": str(pk), "detail": InsufficientStockError.default_detail})
 
+        bump_generations('products', *[product_generation(pk) for pk in quantities])
 
+        reservations = [{"id": pk, "quantity": quantity} for pk, quantity in quantities.items()]
 
+        return Response(reservations, status.HTTP_200_OK)
@@ -0,0 +1,52 @@
+import json
+
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.authtoken.models import Token
+
+from komercio.async_views import AsyncListView, render_json
+
+from .backends import PooledModelBackend
+from .models import Account
+from .serializers import AccountSerializer
+
+
+class AsyncAccountView(AsyncListView):
+    queryset = Account.objects.all()
+    serializer_class = AccountSerializer
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class AsyncLoginView(View):
+    """
+    ``ObtainAuthToken`` for ASGI servers. Password hashing runs in the
+    bounded ``password_executor`` while the event loop keeps serving other
+    requests, instead of holding a ``sync_to_async`` thread for the whole hash.
+    """
+
+    def get_data(self, request):
+        if request.content_type == 'application/json':
+            return json.loads(request.body or b'{}')
+
+        return request.POST
+
+    async def post(self, request, *args, **kwargs):
+        try:
+            data = self.get_data(request)
+        except ValueError as exc:
+            return render_json({'detail': f'JSON parse error - {exc}'}, status=400)
+
+        errors = {field: ['This field is required.'] for field in ('username', 'password') if not data.get(field)}
+
+        if errors:
+            return render_json(errors, status=400)
+
+        user = await PooledModelBackend().aauthenticate(request, username=data['username'], password=data['password'])
+
+        if user is None:
+            return render_json({'non_field_errors': ['Unable to log in with provided credentials.']}, status=400)
+
+        token, _ = await Token.objects.aget_or_create(user=user)
+
+        return render_json({'token': token.key})
@@ -0,0 +1,169 @@
+import hashlib
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+from .models import Account
+
+
+TOKEN_CACHE_DEFAULTS = {
+    'MAX_SIZE': 1024,
+    'TTL': 60,
+    'CACHE_ALIAS': 'default',
+}
+
+
+class TokenCache:
+    """
+    Token to account cache: a per-process LRU in front of the ``CACHE_ALIAS``
+    cache.
+
+    Every token has a stamp in the ``CACHE_ALIAS`` cache, and entries are only
+    trusted while the stamp they were built under is still there, so deleting
+    a stamp invalidates the token in every process sharing that cache. Entries
+    hold column values rather than model instances, which gives each request
+    its own ``Account`` to work with.
+
+    The shared cache never sees a token or a password hash: its keys use a
+    digest of the token and entries hold only ``account_fields``, the other
+    columns being loaded on access.
+    """
+
+    entry_prefix = 'auth-token:'
+    stamp_prefix = 'auth-token-stamp:'
+    account_fields = {
+        'id',
+        'username',
+        'first_name',
+        'last_name',
+        'email',
+        'is_seller',
+        'is_active',
+        'is_staff',
+        'is_superuser',
+        'date_joined',
+    }
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_setting(self, name):
+        return getattr(settings, 'TOKEN_CACHE', {}).get(name, TOKEN_CACHE_DEFAULTS[name])
+
+    @property
+    def backend(self):
+        return caches[self.get_setting('CACHE_ALIAS')]
+
+    def get_local(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                return value
+
+            del self._entries[key]
+            return None
+
+    def set_local(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.get_setting('TTL'), value)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.get_setting('MAX_SIZE'):
+                self._entries.popitem(last=False)
+
+    def get_backend_keys(self, key):
+        """Return the shared cache keys of the token's entry and stamp."""
+        digest = hashlib.sha256(key.encode()).hexdigest()
+        return self.entry_prefix + digest, self.stamp_prefix + digest
+
+    def get_stamp(self, key):
+        """Return the token's current stamp, creating one if there is none."""
+        # Entries never outlive TTL either, so an expired stamp only costs a
+        # lookup, and stamps for unknown tokens do not pile up.
+        stamp_key = self.get_backend_keys(key)[1]
+        self.backend.add(stamp_key, uuid.uuid4().hex, self.get_setting('TTL'))
+        return self.backend.get(stamp_key)
+
+    def get(self, key):
+        entry_key, stamp_key = self.get_backend_keys(key)
+        entry = self.get_local(key)
+
+        if entry is None:
+            found = self.backend.get_many([entry_key, stamp_key])
+            entry = found.get(entry_key)
+            stamp = found.get(stamp_key)
+
+            if entry is not None and entry['stamp'] == stamp:
+                self.set_local(key, entry)
+        else:
+            stamp = self.backend.get(stamp_key)
+
+        if entry is None or entry['stamp'] != stamp:
+            return None
+
+        return self.hydrate(key, entry)
+
+    def set(self, key, credentials, stamp):
+        user, token = credentials
+        entry = {
+            'stamp': stamp,
+            'db': user._state.db,
+            # In concrete field order, which from_db expects when some are missing.
+            'user': {
+                field.attname: getattr(user, field.attname)
+                for field in user._meta.concrete_fields
+                if field.attname in self.account_fields
+            },
+            'created': token.created,
+        }
+
+        self.set_local(key, entry)
+        self.backend.set(self.get_backend_keys(key)[0], entry, self.get_setting('TTL'))
+
+    def hydrate(self, key, entry):
+        user = Account.from_db(entry['db'], list(entry['user']), list(entry['user'].values()))
+        token = Token.from_db(entry['db'], ['key', 'user_id', 'created'], [key, user.pk, entry['created']])
+        token.user = user
+
+        return user, token
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+        self.backend.delete_many(self.get_backend_keys(key))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+token_cache = TokenCache()
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    def authenticate_credentials(self, key):
+        credentials = token_cache.get(key)
+
+        if credentials is None:
+            # Taken before the lookup, so an invalidation racing with it
+            # replaces the stamp and discards what is cached here.
+            stamp = token_cache.get_stamp(key)
+            credentials = super().authenticate_credentials(key)
+            token_cache.set(key, credentials, stamp)
+
+        return credentials
@@ -0,0 +1,58 @@
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+from .hashers import ahash_password, averify_password, hash_password, verify_password
+
+
+UserModel = get_user_model()
+
+
+class PooledModelBackend(ModelBackend):
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+
+        if username is None or password is None:
+            return None
+
+        try:
+            user = UserModel._default_manager.get_by_natural_key(username)
+        except UserModel.DoesNotExist:
+            hash_password(password)
+            return None
+
+        is_correct, needs_rehash = verify_password(password, user.password)
+
+        if not (is_correct and self.user_can_authenticate(user)):
+            return None
+
+        if needs_rehash:
+            user.password = hash_password(password)
+            user.save(update_fields=['password'])
+
+        return user
+
+    async def aauthenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+
+        if username is None or password is None:
+            return None
+
+        try:
+            user = await UserModel._default_manager.aget(**{UserModel.USERNAME_FIELD: username})
+        except UserModel.DoesNotExist:
+            await ahash_password(password)
+            return None
+
+        is_correct, needs_rehash = await averify_password(password, user.password)
+
+        if not (is_correct and self.user_can_authenticate(user)):
+            return None
+
+        if needs_rehash:
+            user.password = await ahash_password(password)
+            await sync_to_async(user.save)(update_fields=['password'])
+
+        return user
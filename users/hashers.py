@@ -0,0 +1,83 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import (
+    Argon2PasswordHasher,
+    BCryptSHA256PasswordHasher,
+    PBKDF2PasswordHasher,
+    check_password,
+    make_password,
+)
+
+
+def get_hasher_param(name, default):
+    return getattr(settings, 'PASSWORD_HASHER_PARAMS', {}).get(name, default)
+
+
+class TunableArgon2PasswordHasher(Argon2PasswordHasher):
+    @property
+    def time_cost(self):
+        return get_hasher_param('ARGON2_TIME_COST', Argon2PasswordHasher.time_cost)
+
+    @property
+    def memory_cost(self):
+        return get_hasher_param('ARGON2_MEMORY_COST', Argon2PasswordHasher.memory_cost)
+
+    @property
+    def parallelism(self):
+        return get_hasher_param('ARGON2_PARALLELISM', Argon2PasswordHasher.parallelism)
+
+
+class TunableBCryptSHA256PasswordHasher(BCryptSHA256PasswordHasher):
+    @property
+    def rounds(self):
+        return get_hasher_param('BCRYPT_ROUNDS', BCryptSHA256PasswordHasher.rounds)
+
+
+class TunablePBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    @property
+    def iterations(self):
+        return get_hasher_param('PBKDF2_ITERATIONS', PBKDF2PasswordHasher.iterations)
+
+
+# Caps concurrent hashing across the sync callers, which hash on their own
+# thread, and the async ones, which hand the work to password_executor so
+# the event loop keeps running.
+hashing_slots = threading.BoundedSemaphore(getattr(settings, 'PASSWORD_HASHING_THREADS', 4))
+
+password_executor = ThreadPoolExecutor(
+    max_workers=getattr(settings, 'PASSWORD_HASHING_THREADS', 4),
+    thread_name_prefix='password-hashing',
+)
+
+
+def _check_password(password, encoded):
+    needs_rehash = []
+
+    with hashing_slots:
+        is_correct = check_password(password, encoded, setter=needs_rehash.append)
+
+    return is_correct, bool(needs_rehash)
+
+
+def _make_password(password):
+    with hashing_slots:
+        return make_password(password)
+
+
+def verify_password(password, encoded):
+    return _check_password(password, encoded)
+
+
+def hash_password(password):
+    return _make_password(password)
+
+
+async def averify_password(password, encoded):
+    return await asyncio.wrap_future(password_executor.submit(_check_password, password, encoded))
+
+
+async def ahash_password(password):
+    return await asyncio.wrap_future(password_executor.submit(_make_password, password))
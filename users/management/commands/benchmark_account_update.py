@@ -0,0 +1,56 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test.utils import setup_test_environment
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from users.models import Account
+
+
+class Command(BaseCommand):
+    help = "Measure PATCH /api/accounts/<pk>/ latency with and without a password change. Nothing is persisted."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=20)
+
+    def measure(self, client, url, data, requests):
+        latencies = []
+
+        for _ in range(requests):
+            started = time.perf_counter()
+            response = client.patch(url, data, format='json')
+            latencies.append((time.perf_counter() - started) * 1000)
+
+            assert response.status_code == 200, response.data
+
+        return statistics.median(latencies), max(latencies)
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+
+        payloads = {
+            'profile only': {'first_name': 'benchmark'},
+            'with password': {'first_name': 'benchmark', 'password': 'benchmark-password'},
+        }
+
+        with transaction.atomic():
+            account = Account.objects.create_user(
+                username='benchmark-account-update',
+                password='benchmark-password',
+                first_name='benchmark',
+                last_name='benchmark',
+                is_seller=False,
+            )
+            client = APIClient()
+            client.credentials(HTTP_AUTHORIZATION='Token ' + Token.objects.create(user=account).key)
+            url = reverse('account-update', kwargs={'pk': account.id})
+
+            for label, data in payloads.items():
+                median, worst = self.measure(client, url, data, options['requests'])
+                self.stdout.write(f'{label}: p50 {median:.2f} ms, max {worst:.2f} ms')
+
+            transaction.set_rollback(True)
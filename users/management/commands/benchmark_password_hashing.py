@@ -0,0 +1,31 @@
+import time
+
+from django.contrib.auth.hashers import PBKDF2PasswordHasher, get_hasher
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "Measure single-core password verifications per second, before and after the configured hasher."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rounds', type=int, default=20)
+        parser.add_argument('--password', default='correct horse battery staple')
+
+    def measure(self, hasher, password, rounds):
+        encoded = hasher.encode(password, hasher.salt())
+        started = time.perf_counter()
+
+        for _ in range(rounds):
+            hasher.verify(password, encoded)
+
+        return rounds / (time.perf_counter() - started)
+
+    def handle(self, *args, **options):
+        hashers = {
+            'before (django pbkdf2_sha256)': PBKDF2PasswordHasher(),
+            f'after ({get_hasher().algorithm})': get_hasher(),
+        }
+
+        for label, hasher in hashers.items():
+            logins_per_second = self.measure(hasher, options['password'], options['rounds'])
+            self.stdout.write(f'{label}: {logins_per_second:.1f} logins/sec per core')
@@ -0,0 +1,17 @@
+# Generated by Django 4.1 on 2026-10-18 15:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="account",
+            index=models.Index(fields=["-date_joined"], name="account_date_joined_idx"),
+        ),
+    ]
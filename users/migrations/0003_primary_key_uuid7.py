@@ -0,0 +1,24 @@
+# Generated by Django 4.1 on 2026-10-18 15:25
+
+from django.db import migrations, models
+import komercio.uuids
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0002_account_date_joined_idx"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="account",
+            name="id",
+            field=models.UUIDField(
+                default=komercio.uuids.generate_primary_key,
+                editable=False,
+                primary_key=True,
+                serialize=False,
+            ),
+        ),
+    ]
@@ -1,12 +1,17 @@
 from django.db import models
 from django.contrib.auth.models import AbstractUser
-import uuid
+from komercio.uuids import generate_primary_key
 
 class Account(AbstractUser):
-    id = models.UUIDField(default=uuid.uuid4, primary_key=True, editable=False)
+    id = models.UUIDField(default=generate_primary_key, primary_key=True, editable=False)
     username = models.CharField(max_length=50, unique=True)
     first_name = models.CharField(max_length=50)
     last_name = models.CharField(max_length=50)
     is_seller = models.BooleanField()
 
     REQUIRED_FIELDS = ['first_name', 'last_name']
+
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            models.Index(fields=['-date_joined'], name='account_date_joined_idx'),
+        ]
@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.core.cache import caches
+
+from komercio.fast_serializers import get_values_serializer
+
+from .models import Account
+from .serializers import AccountSerializer
+
+
+SNAPSHOT_KEY = 'newest-accounts'
+
+
+def get_snapshot_cache():
+    return caches[getattr(settings, 'NEWEST_ACCOUNTS_CACHE_ALIAS', 'default')]
+
+
+def get_newest_accounts():
+    cache = get_snapshot_cache()
+    snapshot = cache.get(SNAPSHOT_KEY)
+
+    if snapshot is None:
+        values_serializer = get_values_serializer(AccountSerializer)
+        accounts = values_serializer.values(Account.objects.order_by('-date_joined'))
+        snapshot = values_serializer.serialize(accounts[:settings.NEWEST_ACCOUNTS_LIMIT])
+        cache.set(SNAPSHOT_KEY, snapshot, settings.NEWEST_ACCOUNTS_TTL)
+
+    return snapshot
+
+
+def invalidate_newest_accounts():
+    get_snapshot_cache().delete(SNAPSHOT_KEY)
@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from .models import Account
+from .hashers import hash_password
 from rest_framework.exceptions import APIException
 
 
@@ -17,4 +18,12 @@ class AccountSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         user = Account.objects.create_user(**validated_data)
         return user
+
+    def update(self, instance, validated_data):
+        password = validated_data.pop('password', None)
+
+        if password is not None:
+            instance.password = hash_password(password)
+
+        return super().update(instance, validated_data)
     
\ No newline at end of file
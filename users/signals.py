@@ -0,0 +1,37 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from .authentication import token_cache
+from .models import Account
+from .newest import invalidate_newest_accounts
+
+
+def delete_tokens_on_commit(using, keys):
+    # A token resolved before the commit would read the old rows and be
+    # cached under the stamp that is deleted now.
+    def delete_tokens():
+        for key in keys:
+            token_cache.delete(key)
+
+    transaction.on_commit(delete_tokens, using=using)
+
+
+@receiver(post_delete, sender=Token)
+def invalidate_deleted_token(sender, instance, using, **kwargs):
+    delete_tokens_on_commit(using, [instance.key])
+
+
+@receiver(post_save, sender=Account)
+@receiver(post_delete, sender=Account)
+def refresh_newest_accounts(sender, instance, **kwargs):
+    invalidate_newest_accounts()
+
+
+@receiver(post_save, sender=Account)
+def invalidate_account_tokens(sender, instance, created, using, **kwargs):
+    if created:
+        return
+
+    delete_tokens_on_commit(using, list(Token.objects.using(using).filter(user_id=instance.pk).values_list('key', flat=True)))
@@ -1,8 +1,14 @@
+import json
+
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.test import override_settings
 from django.urls import reverse
 from rest_framework.authtoken.models import Token
 from rest_framework.test import APITestCase
 from rest_framework.views import status
 
+from users.authentication import CachedTokenAuthentication, TokenCache, token_cache
 from users.serializers import AccountSerializer
 from users.models import Account
 
@@ -201,6 +207,35 @@ class TestAccountUpdateView(APITestCase):
         self.assertEqual(self.data_to_update["last_name"], response.data["last_name"])
 
 
+    def test_account_owner_can_change_password(self):
+        print("Test account owner can change password")
+
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + self.account_owner_token.key)
+        response = self.client.patch(self.update_url, {"password": "4321"})
+
+        account = Account.objects.get(username=self.account_data_1["username"])
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(account.check_password("4321"))
+
+        login_response = self.client.post(reverse("login"), {**self.account_data_1, "password": "4321"})
+
+        self.assertEqual(login_response.status_code, status.HTTP_200_OK)
+
+
+    def test_profile_edit_keeps_password_hash(self):
+        print("Test profile edit without password keeps password hash")
+
+        encoded = Account.objects.get(username=self.account_data_1["username"]).password
+
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + self.account_owner_token.key)
+        self.client.patch(self.update_url, self.data_to_update)
+
+        account = Account.objects.get(username=self.account_data_1["username"])
+
+        self.assertEqual(account.password, encoded)
+
+
     def test_profile_can_not_be_edit_by_non_account_owner(self):
         print("Test user can not edit profile of another account")
 
@@ -265,4 +300,293 @@ class TestAccountUpdateView(APITestCase):
         expected_status_code = status.HTTP_403_FORBIDDEN
         result_status_code = response.status_code
 
-        self.assertEqual(expected_status_code, result_status_code)
\ No newline at end of file
+        self.assertEqual(expected_status_code, result_status_code)
+
+
+class TestCachedTokenAuthentication(APITestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+
+        cls.account_data = {
+            "username": "cloud",
+            "password": "1234",
+            "first_name": "cloud",
+            "last_name": "thorson",
+            "is_seller": False
+        }
+
+        cls.admin_account_data = {
+            "username": "thor",
+            "password": "1234",
+            "first_name": "thor",
+            "last_name": "odinson",
+            "is_seller": False
+        }
+
+        cls.account = Account.objects.create_user(**cls.account_data)
+        admin_account = Account.objects.create_superuser(**cls.admin_account_data)
+
+        cls.account_token = Token.objects.create(user=cls.account)
+        cls.admin_token = Token.objects.create(user=admin_account)
+
+        cls.update_url = reverse("account-update", kwargs={"pk": cls.account.id})
+        cls.manager_url = reverse("account-manager", kwargs={"pk": cls.account.id})
+
+    def setUp(self) -> None:
+        token_cache.clear()
+        cache.clear()
+
+    def test_token_is_resolved_from_cache(self):
+        print("Test token is resolved from the cache after the first request")
+
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + self.account_token.key)
+
+        with self.assertNumQueries(1):
+            self.client.post(reverse("product-reserve"), {}, format="json")
+
+        with self.assertNumQueries(0):
+            self.client.post(reverse("product-reserve"), {}, format="json")
+
+    def test_deactivated_account_token_is_invalidated(self):
+        print("Test deactivated account token is invalidated")
+
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + self.account_token.key)
+        self.client.patch(self.update_url, {"first_name": "cached"})
+
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + self.admin_token.key)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(self.manager_url, {"is_active": False})
+
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + self.account_token.key)
+        response = self.client.patch(self.update_url, {"first_name": "cached"})
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deleted_token_is_invalidated(self):
+        print("Test deleted token is invalidated")
+
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + self.account_token.key)
+        self.client.patch(self.update_url, {"first_name": "cached"})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.account_token.delete()
+
+        response = self.client.patch(self.update_url, {"first_name": "cached"})
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+    def test_invalidation_reaches_other_processes(self):
+        print("Test invalidation drops entries cached by other processes")
+
+        other_process = TokenCache()
+        credentials = CachedTokenAuthentication().authenticate_credentials(self.account_token.key)
+        other_process.set(self.account_token.key, credentials, token_cache.get_stamp(self.account_token.key))
+
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + self.admin_token.key)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(self.manager_url, {"is_active": False})
+
+        self.assertIsNone(other_process.get(self.account_token.key))
+
+    def test_tokens_are_invalidated_on_commit(self):
+        print("Test cached tokens are invalidated once the change commits")
+
+        CachedTokenAuthentication().authenticate_credentials(self.account_token.key)
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.account.save()
+
+            self.assertIsNotNone(token_cache.get(self.account_token.key))
+
+        for callback in callbacks:
+            callback()
+
+        self.assertIsNone(token_cache.get(self.account_token.key))
+
+
+    def test_shared_cache_holds_no_secrets(self):
+        print("Test the shared cache holds no token or password hash")
+
+        CachedTokenAuthentication().authenticate_credentials(self.account_token.key)
+        entry_key, stamp_key = token_cache.get_backend_keys(self.account_token.key)
+        entry = cache.get(entry_key)
+
+        self.assertNotIn(self.account_token.key, entry_key + stamp_key)
+        self.assertIsNotNone(cache.get(stamp_key))
+        self.assertNotIn("password", entry["user"])
+
+        token_cache.clear()
+        user, _ = token_cache.get(self.account_token.key)
+
+        self.assertEqual(user.username, "cloud")
+        self.assertTrue(user.check_password("1234"))
+
+
+    def test_requests_get_their_own_account(self):
+        print("Test cached tokens give every request its own account instance")
+
+        first_user, first_token = CachedTokenAuthentication().authenticate_credentials(self.account_token.key)
+        second_user, second_token = CachedTokenAuthentication().authenticate_credentials(self.account_token.key)
+
+        self.assertIsNot(first_user, second_user)
+        self.assertEqual(first_user, second_user)
+        self.assertEqual(second_user.username, "cloud")
+        self.assertEqual(second_token.key, self.account_token.key)
+        self.assertIs(second_token.user, second_user)
+
+
+class TestLoginPasswordHashing(APITestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.login_url = reverse("login")
+        cls.async_login_url = reverse("async-login")
+
+        cls.account_data = {
+            "username": "cloud",
+            "first_name": "cloud",
+            "last_name": "thorson",
+            "is_seller": True
+        }
+
+        cls.account = Account.objects.create(
+            **cls.account_data,
+            password=make_password("1234", hasher="pbkdf2_sha256"),
+        )
+
+    def test_login_rehashes_legacy_password(self):
+        print("Test login rehashes a legacy password hash")
+
+        response = self.client.post(self.login_url, {"username": "cloud", "password": "1234"})
+
+        self.account.refresh_from_db()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(self.account.password.startswith("argon2"))
+
+        response = self.client.post(self.login_url, {"username": "cloud", "password": "1234"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_login_rehashes_bcrypt_password(self):
+        print("Test login rehashes a bcrypt password hash")
+
+        Account.objects.filter(id=self.account.id).update(password=make_password("1234", hasher="bcrypt_sha256"))
+
+        response = self.client.post(self.login_url, {"username": "cloud", "password": "1234"})
+
+        self.account.refresh_from_db()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(self.account.password.startswith("argon2"))
+
+    async def test_async_login_rehashes_legacy_password(self):
+        print("Test async login returns a token and rehashes a legacy password hash")
+
+        response = await self.async_client.post(
+            self.async_login_url, "username=cloud&password=1234", content_type="application/x-www-form-urlencoded"
+        )
+        wrong_response = await self.async_client.post(
+            self.async_login_url, {"username": "cloud", "password": "4321"}, content_type="application/json"
+        )
+        account = await Account.objects.aget(id=self.account.id)
+        token = await Token.objects.aget(user=account)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(json.loads(response.content), {"token": token.key})
+        self.assertTrue(account.password.startswith("argon2"))
+        self.assertEqual(wrong_response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("non_field_errors", json.loads(wrong_response.content))
+
+    @override_settings(PASSWORD_HASHER_PARAMS={"PBKDF2_ITERATIONS": 1000})
+    def test_hasher_params_are_read_when_hashing(self):
+        print("Test hasher cost parameters follow the settings")
+
+        self.assertTrue(make_password("1234", hasher="pbkdf2_sha256").startswith("pbkdf2_sha256$1000$"))
+
+    def test_login_with_wrong_password(self):
+        print("Test login with a wrong password")
+
+        response = self.client.post(self.login_url, {"username": "cloud", "password": "4321"})
+
+        self.account.refresh_from_db()
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertTrue(self.account.password.startswith("pbkdf2_sha256"))
+
+    def test_login_with_inactive_account(self):
+        print("Test login with an inactive account")
+
+        Account.objects.filter(id=self.account.id).update(is_active=False)
+
+        response = self.client.post(self.login_url, {"username": "cloud", "password": "1234"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class TestAccountOrderView(APITestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.register_url = reverse("account-register")
+
+        cls.account_data = {
+            "password": "1234",
+            "first_name": "cloud",
+            "last_name": "thorson",
+            "is_seller": False
+        }
+
+        for index in range(4):
+            Account.objects.create_user(**cls.account_data, username=f"cloud {index}")
+
+    def setUp(self) -> None:
+        cache.clear()
+
+    @override_settings(NEWEST_ACCOUNTS_LIMIT=3)
+    def test_newest_accounts_are_capped(self):
+        print("Test newest accounts are capped")
+
+        response = self.client.get(reverse("list-view", kwargs={"num": 10}))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 3)
+        self.assertEqual(response.data["results"][0]["username"], "cloud 3")
+
+    def test_newest_accounts_are_served_from_snapshot(self):
+        print("Test newest accounts are served from the snapshot")
+
+        self.client.get(reverse("list-view", kwargs={"num": 2}))
+
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse("list-view", kwargs={"num": 2}))
+
+        self.assertEqual([account["username"] for account in response.data["results"]], ["cloud 3", "cloud 2"])
+
+    def test_signup_refreshes_snapshot(self):
+        print("Test signup refreshes the newest accounts snapshot")
+
+        self.client.get(reverse("list-view", kwargs={"num": 1}))
+        self.client.post(self.register_url, {**self.account_data, "username": "odin"})
+
+        response = self.client.get(reverse("list-view", kwargs={"num": 1}))
+
+        self.assertEqual(response.data["results"][0]["username"], "odin")
+
+
+class TestAsyncAccountView(APITestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        for index in range(3):
+            Account.objects.create_user(username=f"user{index}", password="1234", first_name="user", last_name=str(index), is_seller=False)
+
+    async def test_async_list_accounts(self):
+        response = await self.async_client.get(reverse("async-account-view"))
+        body = json.loads(response.content)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(body["count"], 3)
+        self.assertEqual(len(body["results"]), 2)
+        self.assertIsNotNone(body["next"])
+        self.assertNotIn("password", body["results"][0])
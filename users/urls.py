@@ -1,11 +1,13 @@
 from django.urls import path
 from rest_framework.authtoken.views import ObtainAuthToken
-from . import views
+from . import async_views, views
 
 urlpatterns = [
    path('accounts/', views.AccountView.as_view(), name="account-register"),
    path('accounts/newest/<int:num>/', views.AccountOrderView.as_view(), name="list-view"),
    path('login/', ObtainAuthToken.as_view(), name="login"),
    path('accounts/<pk>/', views.AccountUpdateView.as_view(), name="account-update"),
-   path('accounts/<pk>/management/', views.AccountManageView.as_view(), name="account-manager")
+   path('accounts/<pk>/management/', views.AccountManageView.as_view(), name="account-manager"),
+   path('async/accounts/', async_views.AsyncAccountView.as_view(), name="async-account-view"),
+   path('async/login/', async_views.AsyncLoginView.as_view(), name="async-login"),
 ]
\ No newline at end of file
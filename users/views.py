@@ -1,13 +1,17 @@
+from django.conf import settings
 from rest_framework import generics
-from rest_framework.authentication import TokenAuthentication
 from rest_framework.permissions import IsAdminUser
 
+from komercio.fast_serializers import FastListMixin
+
+from .authentication import CachedTokenAuthentication
 from .models import Account
+from .newest import get_newest_accounts
 from .serializers import AccountSerializer
 from .permissions import IsAccountOwner
 
 
-class AccountView(generics.ListCreateAPIView):
+class AccountView(FastListMixin, generics.ListCreateAPIView):
     queryset = Account.objects.all()
     serializer_class = AccountSerializer
 
@@ -16,13 +20,15 @@ class AccountOrderView(generics.ListAPIView):
     queryset = Account.objects.all()
     serializer_class = AccountSerializer
 
-    def get_queryset(self):
-        num = self.kwargs['num']
-        return self.queryset.order_by('-date_joined')[0:num]
+    def list(self, request, *args, **kwargs):
+        num = min(self.kwargs['num'], settings.NEWEST_ACCOUNTS_LIMIT)
+        page = self.paginate_queryset(get_newest_accounts()[0:num])
+
+        return self.get_paginated_response(page)
 
 
 class AccountUpdateView(generics.UpdateAPIView):
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAccountOwner]
 
     queryset = Account.objects.all()
@@ -38,7 +44,7 @@ class AccountUpdateView(generics.UpdateAPIView):
 
 
 class AccountManageView(generics.UpdateAPIView):
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAdminUser]
 
     queryset = Account.objects.all()